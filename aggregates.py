@@ -0,0 +1,177 @@
+from typing import List, Dict, Any, Optional, Set
+import bisect
+import numpy as np
+
+
+class BucketStats:
+    """Agregados de uma janela de tempo.
+
+    Os conjuntos de remetentes e destinatários permitem contar endereços
+    únicos na união de várias janelas (summarize). Eles dominam a memória
+    do bucket, por isso existem apenas nas janelas de tempo, e não por bloco.
+    """
+
+    __slots__ = ('start', 'count', 'volume', 'senders', 'receivers')
+
+    def __init__(self, start: float):
+        self.start = start  # Início da janela
+        self.count = 0
+        self.volume = 0.0
+        self.senders: Set[str] = set()
+        self.receivers: Set[str] = set()
+
+    def add(self, transaction):
+        """Acumula uma transação no bucket."""
+        self.count += 1
+        self.volume += transaction.amount
+        if transaction.sender:
+            self.senders.add(transaction.sender)
+        if transaction.receiver:
+            self.receivers.add(transaction.receiver)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converte o bucket para um dicionário."""
+        return {
+            'start': self.start,
+            'transactions_count': self.count,
+            'volume': self.volume,
+            'unique_senders': len(self.senders),
+            'unique_receivers': len(self.receivers)
+        }
+
+
+class AggregateStore:
+    """Agregados pré-computados por bloco e por janelas de minuto, hora e dia.
+
+    É atualizado incrementalmente a cada bloco indexado, de modo que as
+    consultas analíticas custam O(buckets) em vez de O(transações). Os
+    agregados por bloco ficam em arrays NumPy (posição = altura), que
+    crescem por duplicação como na visão colunar.
+    """
+
+    GRANULARITIES = {
+        'minute': 60,
+        'hour': 3600,
+        'day': 86400
+    }
+
+    BLOCK_COLUMNS = {
+        'block_counts': np.int64,
+        'block_volumes': np.float64,
+        'block_senders': np.int32,
+        'block_receivers': np.int32,
+        'block_timestamps': np.float64
+    }
+
+    def __init__(self, initial_capacity: int = 1024):
+        self.block_count = 0
+        for name, dtype in self.BLOCK_COLUMNS.items():
+            setattr(self, name, np.zeros(initial_capacity, dtype=dtype))
+        self.buckets: Dict[str, Dict[float, BucketStats]] = {g: {} for g in self.GRANULARITIES}
+        self.bucket_keys: Dict[str, List[float]] = {g: [] for g in self.GRANULARITIES}
+        self.total_transactions = 0
+        self.total_volume = 0.0
+
+    def _reserve_block(self):
+        """Garante espaço para mais um bloco, dobrando a capacidade."""
+        capacity = len(self.block_counts)
+        if self.block_count < capacity:
+            return
+        for name in self.BLOCK_COLUMNS:
+            column = getattr(self, name)
+            grown = np.zeros(capacity * 2, dtype=column.dtype)
+            grown[:self.block_count] = column
+            setattr(self, name, grown)
+
+    def add_block(self, block):
+        """Acumula as transações de um bloco recém-indexado."""
+        volume = 0.0
+        senders: Set[str] = set()
+        receivers: Set[str] = set()
+
+        for transaction in block.transactions:
+            volume += transaction.amount
+            if transaction.sender:
+                senders.add(transaction.sender)
+            if transaction.receiver:
+                receivers.add(transaction.receiver)
+
+            for granularity, width in self.GRANULARITIES.items():
+                self._get_bucket(granularity, transaction.timestamp - transaction.timestamp % width).add(transaction)
+
+        self._reserve_block()
+        position = self.block_count
+        self.block_counts[position] = len(block.transactions)
+        self.block_volumes[position] = volume
+        self.block_senders[position] = len(senders)
+        self.block_receivers[position] = len(receivers)
+        self.block_timestamps[position] = block.timestamp
+        self.block_count += 1
+        self.total_transactions += len(block.transactions)
+        self.total_volume += volume
+
+    def _get_bucket(self, granularity: str, start: float) -> BucketStats:
+        """Retorna (criando se necessário) o bucket que começa em start."""
+        buckets = self.buckets[granularity]
+        bucket = buckets.get(start)
+        if bucket is None:
+            bucket = buckets[start] = BucketStats(start)
+            keys = self.bucket_keys[granularity]
+            # Na prática os timestamps são crescentes e isto é um append
+            bisect.insort(keys, start)
+        return bucket
+
+    def _bucket_range(self, granularity: str, start_time: float, end_time: float) -> List[float]:
+        """Localiza por busca binária os inícios dos buckets que cobrem o intervalo."""
+        if granularity not in self.GRANULARITIES:
+            raise ValueError(f"Granularidade inválida: {granularity}")
+
+        width = self.GRANULARITIES[granularity]
+        keys = self.bucket_keys[granularity]
+        first = bisect.bisect_left(keys, start_time - start_time % width)
+        last = bisect.bisect_right(keys, end_time)
+        return keys[first:last]
+
+    def get_block_stats(self, start: int = 0, stop: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Retorna os agregados dos blocos no intervalo de alturas [start, stop)."""
+        start, stop, _ = slice(start, stop).indices(self.block_count)
+        return [
+            {
+                'start': height,
+                'transactions_count': int(self.block_counts[height]),
+                'volume': float(self.block_volumes[height]),
+                'unique_senders': int(self.block_senders[height]),
+                'unique_receivers': int(self.block_receivers[height]),
+                'timestamp': float(self.block_timestamps[height])
+            }
+            for height in range(start, stop)
+        ]
+
+    def get_buckets(self, granularity: str, start_time: float, end_time: float) -> List[Dict[str, Any]]:
+        """Retorna os buckets de uma granularidade que se sobrepõem ao intervalo."""
+        keys = self._bucket_range(granularity, start_time, end_time)
+        buckets = self.buckets[granularity]
+        return [buckets[key].to_dict() for key in keys]
+
+    def summarize(self, granularity: str, start_time: float, end_time: float) -> Dict[str, Any]:
+        """Totaliza os buckets de um intervalo de tempo."""
+        keys = self._bucket_range(granularity, start_time, end_time)
+
+        count = 0
+        volume = 0.0
+        senders: Set[str] = set()
+        receivers: Set[str] = set()
+        for key in keys:
+            bucket = self.buckets[granularity][key]
+            count += bucket.count
+            volume += bucket.volume
+            senders |= bucket.senders
+            receivers |= bucket.receivers
+
+        return {
+            'buckets': len(keys),
+            'transactions_count': count,
+            'volume': volume,
+            'unique_senders': len(senders),
+            'unique_receivers': len(receivers)
+        }
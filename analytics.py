@@ -0,0 +1,144 @@
+from typing import List, Dict, Any, Optional
+import numpy as np
+
+from blockchain import AddressTable
+
+
+class ColumnarAnalytics:
+    """Visão colunar das transações confirmadas para consultas vetorizadas.
+
+    Cada transação ocupa uma posição em arrays NumPy (valor, taxa, timestamp,
+    altura do bloco e códigos inteiros de remetente/destinatário). Os arrays
+    crescem por duplicação e são atualizados a cada bloco indexado, de modo
+    que saldos de todos os endereços, top-N e volumes por janela são
+    calculados sem laços Python sobre as transações.
+    """
+
+    NO_ADDRESS = -1  # Código de remetente ausente (recompensa de mineração)
+
+    def __init__(self, initial_capacity: int = 1024):
+        self.addresses = AddressTable()
+        self.size = 0
+        self.amounts = np.zeros(initial_capacity, dtype=np.float64)
+        self.fees = np.zeros(initial_capacity, dtype=np.float64)
+        self.timestamps = np.zeros(initial_capacity, dtype=np.float64)
+        self.heights = np.zeros(initial_capacity, dtype=np.int64)
+        self.senders = np.zeros(initial_capacity, dtype=np.int32)
+        self.receivers = np.zeros(initial_capacity, dtype=np.int32)
+
+    def _address_code(self, address: Optional[str]) -> int:
+        """Retorna o código inteiro de um endereço (NO_ADDRESS para None)."""
+        if address is None:
+            return self.NO_ADDRESS
+        return self.addresses.intern(address)
+
+    def _reserve(self, extra: int):
+        """Garante espaço para mais `extra` linhas, dobrando a capacidade."""
+        capacity = len(self.amounts)
+        needed = self.size + extra
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ('amounts', 'fees', 'timestamps', 'heights', 'senders', 'receivers'):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            setattr(self, name, grown)
+
+    def add_block(self, block):
+        """Acrescenta as transações de um bloco às colunas."""
+        count = len(block.transactions)
+        self._reserve(count)
+        start, end = self.size, self.size + count
+
+        transactions = block.transactions
+        self.amounts[start:end] = [tx.amount for tx in transactions]
+        self.fees[start:end] = [tx.fee for tx in transactions]
+        self.timestamps[start:end] = [tx.timestamp for tx in transactions]
+        self.heights[start:end] = block.index
+        self.senders[start:end] = [self._address_code(tx.sender) for tx in transactions]
+        self.receivers[start:end] = [self._address_code(tx.receiver) for tx in transactions]
+        self.size = end
+
+    def _columns(self, mask: Optional[np.ndarray] = None):
+        """Retorna visões (sem cópia) das colunas preenchidas, opcionalmente filtradas."""
+        columns = (
+            self.amounts[:self.size],
+            self.fees[:self.size],
+            self.senders[:self.size],
+            self.receivers[:self.size]
+        )
+        if mask is None:
+            return columns
+        return tuple(column[mask] for column in columns)
+
+    def _net_flow(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Entradas menos saídas (valor + taxa) por código de endereço."""
+        amounts, fees, senders, receivers = self._columns(mask)
+        n_addresses = len(self.addresses.addresses)
+
+        sent = senders != self.NO_ADDRESS
+        outflow = np.bincount(senders[sent], weights=(amounts + fees)[sent], minlength=n_addresses)
+        inflow = np.bincount(receivers, weights=amounts, minlength=n_addresses)
+        return inflow - outflow
+
+    def _time_mask(self, start_time: float, end_time: float) -> np.ndarray:
+        """Máscara das transações com timestamp no intervalo [start_time, end_time]."""
+        timestamps = self.timestamps[:self.size]
+        return (timestamps >= start_time) & (timestamps <= end_time)
+
+    def get_balances(self) -> Dict[str, float]:
+        """Saldos de todos os endereços em uma única passada vetorizada."""
+        balances = self._net_flow()
+        return dict(zip(self.addresses.addresses, balances.tolist()))
+
+    def top_balances(self, n: int = 10) -> List[Dict[str, Any]]:
+        """Retorna os n endereços de maior saldo."""
+        balances = self._net_flow()
+        if len(balances) == 0:
+            return []
+        n = min(n, len(balances))
+        # argpartition seleciona os n maiores em O(endereços); só eles são ordenados
+        top = np.argpartition(-balances, n - 1)[:n]
+        top = top[np.argsort(-balances[top], kind='stable')]
+        return [
+            {'address': self.addresses.lookup(int(code)), 'balance': float(balances[code])}
+            for code in top
+        ]
+
+    def net_flow(self, start_time: float, end_time: float) -> Dict[str, float]:
+        """Fluxo líquido por endereço dentro de uma janela de tempo."""
+        flow = self._net_flow(self._time_mask(start_time, end_time))
+        return {
+            address: value
+            for address, value in zip(self.addresses.addresses, flow.tolist())
+            if value != 0
+        }
+
+    def window_volume(self, start_time: float, end_time: float) -> Dict[str, Any]:
+        """Volume, taxas e número de transações dentro de uma janela de tempo."""
+        amounts, fees, _, _ = self._columns(self._time_mask(start_time, end_time))
+        return {
+            'transactions_count': int(len(amounts)),
+            'volume': float(amounts.sum()),
+            'fees': float(fees.sum())
+        }
+
+    def to_dataframe(self):
+        """Exporta as colunas para um DataFrame do pandas.
+
+        As colunas numéricas são passadas sem cópia; os endereços viram
+        categorias que reutilizam os códigos inteiros já armazenados.
+        """
+        import pandas as pd
+
+        categories = pd.Index(self.addresses.addresses, dtype=object)
+        return pd.DataFrame({
+            'amount': self.amounts[:self.size],
+            'fee': self.fees[:self.size],
+            'timestamp': self.timestamps[:self.size],
+            'block_index': self.heights[:self.size],
+            'sender': pd.Categorical.from_codes(self.senders[:self.size], categories=categories),
+            'receiver': pd.Categorical.from_codes(self.receivers[:self.size], categories=categories)
+        }, copy=False)
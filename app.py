@@ -1,9 +1,23 @@
 import streamlit as st
 import pandas as pd
 import json
+import os
+import tempfile
 import time
 from datetime import datetime
 from blockchain_indexer import BlockchainIndexer
+from aggregates import AggregateStore
+from replicas import ReplicaPublisher, IndexReader
+from rwlock import ReadWriteLock, ReadLocked
+
+# Diretório das réplicas de leitura. Processos iniciados com
+# BLOCKCHAIN_READ_ONLY=1 não constroem indexador: apenas mapeiam os
+# segmentos publicados pelo processo escritor neste diretório.
+REPLICA_DIR = os.environ.get(
+    'BLOCKCHAIN_REPLICA_DIR',
+    os.path.join('/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir(), 'blockchain_replica')
+)
+READ_ONLY = os.environ.get('BLOCKCHAIN_READ_ONLY') == '1'
 
 # Configuração da página
 st.set_page_config(
@@ -15,11 +29,34 @@ st.set_page_config(
 st.image("https://upload.wikimedia.org/wikipedia/commons/thumb/c/c3/Webysther_20160322_-_Logo_UnB_%28sem_texto%29.svg/1920px-Webysther_20160322_-_Logo_UnB_%28sem_texto%29.svg.png", width=100) 
 st.markdown("##### Projeto e Complexidade de Algoritmos - Estrutura de Dados baseadas em árvores ") # Título adicionado
 st.markdown("---")
-# Inicializar o indexador na sessão
-if 'indexer' not in st.session_state:
-    st.session_state.indexer = BlockchainIndexer()
+# Indexador único do processo, compartilhado por todas as sessões. As
+# leituras usam o lado compartilhado do lock e as escritas o exclusivo,
+# publicando os novos blocos na réplica. Só um processo por diretório
+# publica: os demais caem para somente leitura.
+@st.cache_resource
+def get_writer():
+    indexer = BlockchainIndexer()
+    publisher = ReplicaPublisher(indexer, REPLICA_DIR)
+    publisher.publish()
+    return indexer, publisher, ReadWriteLock()
 
-indexer = st.session_state.indexer
+# Leitor da réplica (mmap): segmentos compartilhados entre processos
+@st.cache_resource
+def get_reader():
+    return IndexReader(REPLICA_DIR)
+
+writer_error = None
+if not READ_ONLY:
+    try:
+        shared_indexer, publisher, indexer_lock = get_writer()
+        indexer = ReadLocked(shared_indexer, indexer_lock)
+    except Exception as e:
+        writer_error = str(e)
+        READ_ONLY = True
+if READ_ONLY:
+    indexer = None
+    publisher = indexer_lock = None
+reader = get_reader()
 
 # Título principal
 st.title(" Blockchain B-tree Indexer")
@@ -28,9 +65,15 @@ st.markdown("**Demonstração de indexação de blockchain usando B-trees para c
 
 # Sidebar para navegação
 st.sidebar.title(" Menu")
+QUERY_PAGES = [
+    "Consultar por ID",
+    "Consultar por Remetente",
+    "Consultar por Destinatário",
+    "Consultar por Período"
+]
 page = st.sidebar.selectbox(
     "Escolha uma funcionalidade:",
-    [
+    QUERY_PAGES if READ_ONLY else [
         "Dashboard",
         "Adicionar Transação",
         "Minerar Bloco",
@@ -39,11 +82,25 @@ page = st.sidebar.selectbox(
         "Consultar por Destinatário",
         "Consultar por Período",
         "Consultar Saldo",
+        "Consultar Relações",
         "Dados de Demonstração",
         "Visualizar Blockchain"
     ]
 )
 
+# Fonte das consultas de transações: réplica compartilhada ou indexador
+if READ_ONLY:
+    if writer_error:
+        st.sidebar.warning(f"{writer_error} Este processo atende apenas consultas.")
+    st.sidebar.caption(f"Réplica somente leitura: {reader.get_chain_height()} bloco(s) publicado(s)")
+    query_source = reader
+else:
+    use_replica = st.sidebar.checkbox(
+        "Consultar pela réplica compartilhada", value=True,
+        help="Buscas por ID, remetente, destinatário e período leem os segmentos mapeados (IndexReader)."
+    )
+    query_source = reader if use_replica else indexer
+
 # Função para formatar timestamp
 def format_timestamp(timestamp):
     return datetime.fromtimestamp(timestamp).strftime("%d/%m/%Y %H:%M:%S")
@@ -61,6 +118,87 @@ def display_transaction(tx_data):
     else:
         st.write(tx_data)
 
+# Função para exibir um bloco
+def display_block(block, expanded=False):
+    with st.expander(f" Bloco {block['index']} - {block['hash'][:16]}...", expanded=expanded):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.write(f"**Índice:** {block['index']}")
+            st.write(f"**Timestamp:** {format_timestamp(block['timestamp'])}")
+            st.write(f"**Hash Anterior:** {block['previous_hash'][:16]}...")
+        
+        with col2:
+            st.write(f"**Hash:** {block['hash'][:16]}...")
+            st.write(f"**Nonce:** {block['nonce']}")
+            st.write(f"**Transações:** {len(block['transactions'])}")
+        
+        if block['transactions']:
+            st.write("** Transações:**")
+            for i, tx in enumerate(block['transactions']):
+                st.write(f"{i+1}. {tx['transaction_id']}: {tx['sender']} → {tx['receiver']} ({tx['amount']})")
+
+# Quantidade de itens exibidos por página nas listagens
+PAGE_SIZE = 20
+
+# Função para escolher a página de uma listagem
+def page_selector(total_items, page_size, key):
+    total_pages = max((total_items + page_size - 1) // page_size, 1)
+    if total_pages == 1:
+        return 0
+    page = st.number_input(f"Página (1 a {total_pages})", min_value=1, max_value=total_pages,
+                           value=1, step=1, key=key)
+    return int(page) - 1
+
+# Função para exibir a página atual de uma consulta paginada por cursor.
+# fetch_page(offset, limit) retorna {'items', 'offset', 'has_more'}; só a
+# página atual é lida do índice, então o total de resultados não é conhecido.
+def display_result_page(fetch_page, key, found_message):
+    page_number = st.session_state.get(key, 0)
+    result_page = fetch_page(page_number * PAGE_SIZE, PAGE_SIZE)
+    results = result_page['items']
+    
+    if not results:
+        return False
+    
+    st.success(f"✅ Exibindo página {page_number + 1} {found_message}!")
+    for i, result in enumerate(results, start=result_page['offset']):
+        with st.expander(f" Transação {i+1}", expanded=False):
+            display_transaction(result)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        if page_number > 0 and st.button("⬅️ Página anterior", key=f"{key}_previous"):
+            st.session_state[key] = page_number - 1
+            st.rerun()
+    with col2:
+        if result_page['has_more'] and st.button("Próxima página ➡️", key=f"{key}_next"):
+            st.session_state[key] = page_number + 1
+            st.rerun()
+    return True
+
+# Quantidade de blocos recentes exibidos no gráfico do Dashboard
+DASHBOARD_BLOCKS = 100
+# Quantidade de janelas de tempo exibidas no gráfico de atividade
+DASHBOARD_BUCKETS = 48
+
+# Páginas de blocos em cache, indexadas pelo hash do último bloco: um novo
+# bloco (ou outra cadeia) muda a chave. O indexador não é "hasheado" (prefixo _).
+@st.cache_data(show_spinner=False, max_entries=64)
+def cached_blocks_page(_indexer, tip_hash, page, page_size):
+    return _indexer.get_blocks_page(page, page_size)
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def cached_block_counts(_indexer, tip_hash, window):
+    block_data = []
+    for block in _indexer.get_block_transaction_counts(-window):
+        block_data.append({
+            'Bloco': block['index'],
+            'Transações': block['transactions_count'],
+            'Timestamp': format_timestamp(block['timestamp'])
+        })
+    return pd.DataFrame(block_data)
+
 # Dashboard
 if page == "Dashboard":
     st.header(" Estatísticas do Blockchain")
@@ -89,19 +227,38 @@ if page == "Dashboard":
     
     # Gráfico de transações por bloco (se houver dados)
     if stats['total_blocks'] > 1:
-        st.subheader("Transações por Bloco")
-        blockchain_data = indexer.get_full_blockchain()
+        st.subheader(f"Transações por Bloco (últimos {DASHBOARD_BLOCKS})")
+        df = cached_block_counts(indexer, indexer.blockchain.get_latest_block().hash, DASHBOARD_BLOCKS)
+        st.bar_chart(df.set_index('Bloco')['Transações'])
         
-        block_data = []
-        for block in blockchain_data['chain']:
-            block_data.append({
-                'Bloco': block['index'],
-                'Transações': len(block['transactions']),
-                'Timestamp': format_timestamp(block['timestamp'])
-            })
+        # Atividade por janela de tempo, lida dos agregados pré-computados
+        st.subheader(f"Atividade por Período (últimas {DASHBOARD_BUCKETS} janelas)")
+        granularity_labels = {"Minuto": "minute", "Hora": "hour", "Dia": "day"}
+        granularity = granularity_labels[st.selectbox("Agrupar por", list(granularity_labels.keys()), index=1)]
+        # Janela terminando no último bloco, para não percorrer todo o histórico
+        end_time = indexer.blockchain.get_latest_block().timestamp
+        start_time = end_time - AggregateStore.GRANULARITIES[granularity] * (DASHBOARD_BUCKETS - 1)
+        activity = indexer.get_activity(granularity, start_time, end_time)
         
-        df = pd.DataFrame(block_data)
-        st.bar_chart(df.set_index('Bloco')['Transações'])
+        activity_df = pd.DataFrame([
+            {
+                'Período': format_timestamp(bucket['start']),
+                'Transações': bucket['transactions_count'],
+                'Volume': bucket['volume']
+            }
+            for bucket in activity
+        ])
+        if activity_df.empty:
+            st.info("Nenhuma transação no período.")
+        else:
+            st.bar_chart(activity_df.set_index('Período')[['Transações', 'Volume']])
+        
+        # Maiores saldos, calculados de forma vetorizada sobre a visão colunar
+        st.subheader("Maiores Saldos")
+        top_df = pd.DataFrame(indexer.get_top_balances(10))
+        if not top_df.empty:
+            top_df.columns = ['Endereço', 'Saldo']
+            st.dataframe(top_df, hide_index=True)
 
 # Adicionar Transação
 elif page == "Adicionar Transação":
@@ -117,13 +274,15 @@ elif page == "Adicionar Transação":
             receiver = st.text_input("Destinatário", placeholder="Ex: Matheus")
         
         amount = st.number_input("Valor", min_value=0.01, step=0.01, format="%.2f")
+        fee = st.number_input("Taxa (prioridade na mineração)", min_value=0.0, step=0.01, format="%.2f")
         
         submitted = st.form_submit_button("➕ Adicionar Transação")
         
         if submitted:
             if sender and receiver and amount > 0:
                 try:
-                    tx_id = indexer.add_transaction(sender, receiver, amount)
+                    with indexer_lock.write():
+                        tx_id = indexer.add_transaction(sender, receiver, amount, fee)
                     st.success(f"✅ Transação adicionada com sucesso!")
                     st.info(f"**ID da Transação:** {tx_id}")
                 except Exception as e:
@@ -150,11 +309,12 @@ elif page == "Minerar Bloco":
         if st.button("Minerar Bloco"):
             if miner_address:
                 try:
-                    with st.spinner("⛏️ Minerando bloco..."):
+                    with st.spinner("⛏️ Minerando bloco..."), indexer_lock.write():
                         if miner_name.strip():
                             block_info = indexer.mine_block(miner_address, miner_name.strip())
                         else:
                             block_info = indexer.mine_block(miner_address)
+                        publisher.publish()
                     st.success("Bloco minerado com sucesso!")
                     col1, col2 = st.columns(2)
                     with col1:
@@ -179,14 +339,22 @@ elif page == "Consultar por ID":
     if st.button(" Buscar"):
         if transaction_id:
             try:
-                result = indexer.get_transaction_by_id(transaction_id)
+                result = query_source.get_transaction_by_id(transaction_id)
                 
                 if result:
                     st.success("✅ Transação encontrada!")
                     with st.expander(" Detalhes da Transação", expanded=True):
                         display_transaction(result)
                 else:
-                    st.warning(" Transação não encontrada.")
+                    # ID truncado: buscar por prefixo no índice
+                    matches = query_source.search_transactions_by_id_prefix(transaction_id, PAGE_SIZE)
+                    if matches:
+                        st.info(f" Nenhum ID exato; {len(matches)} transação(ões) começam com '{transaction_id}'.")
+                        for i, match in enumerate(matches):
+                            with st.expander(f" {match['transaction']['transaction_id']}", expanded=(i == 0)):
+                                display_transaction(match)
+                    else:
+                        st.warning(" Transação não encontrada.")
             except Exception as e:
                 st.error(f" Erro na busca: {str(e)}")
         else:
@@ -200,21 +368,25 @@ elif page == "Consultar por Remetente":
     
     if st.button("🔍 Buscar"):
         if sender:
-            try:
-                results = indexer.get_transactions_by_sender(sender)
-                
-                if results:
-                    st.success(f"✅ Encontradas {len(results)} transação(ões)!")
-                    
-                    for i, result in enumerate(results):
-                        with st.expander(f" Transação {i+1}", expanded=False):
-                            display_transaction(result)
-                else:
-                    st.warning(" Nenhuma transação encontrada para este remetente.")
-            except Exception as e:
-                st.error(f"❌ Erro na busca: {str(e)}")
+            # Guardar a consulta para que a troca de página não perca os resultados
+            st.session_state.sender_query = sender
+            st.session_state.sender_page = 0
         else:
+            st.session_state.pop('sender_query', None)
             st.error("❌ Por favor, informe o remetente.")
+    
+    if st.session_state.get('sender_query'):
+        try:
+            # Cursor do índice de remetentes: lê só a página atual
+            sender = st.session_state.sender_query
+            found = display_result_page(
+                lambda offset, limit: query_source.get_transactions_by_sender_page(sender, offset, limit),
+                "sender_page", "das transações do remetente"
+            )
+            if not found:
+                st.warning(" Nenhuma transação encontrada para este remetente.")
+        except Exception as e:
+            st.error(f"❌ Erro na busca: {str(e)}")
 
 # Consultar por Destinatário
 elif page == "Consultar por Destinatário":
@@ -224,21 +396,25 @@ elif page == "Consultar por Destinatário":
     
     if st.button("🔍 Buscar"):
         if receiver:
-            try:
-                results = indexer.get_transactions_by_receiver(receiver)
-                
-                if results:
-                    st.success(f"✅ Encontradas {len(results)} transação(ões)!")
-                    
-                    for i, result in enumerate(results):
-                        with st.expander(f" Transação {i+1}", expanded=False):
-                            display_transaction(result)
-                else:
-                    st.warning(" Nenhuma transação encontrada para este destinatário.")
-            except Exception as e:
-                st.error(f" Erro na busca: {str(e)}")
+            # Guardar a consulta para que a troca de página não perca os resultados
+            st.session_state.receiver_query = receiver
+            st.session_state.receiver_page = 0
         else:
+            st.session_state.pop('receiver_query', None)
             st.error(" Por favor, informe o destinatário.")
+    
+    if st.session_state.get('receiver_query'):
+        try:
+            # Cursor do índice de destinatários: lê só a página atual
+            receiver = st.session_state.receiver_query
+            found = display_result_page(
+                lambda offset, limit: query_source.get_transactions_by_receiver_page(receiver, offset, limit),
+                "receiver_page", "das transações para o destinatário"
+            )
+            if not found:
+                st.warning(" Nenhuma transação encontrada para este destinatário.")
+        except Exception as e:
+            st.error(f" Erro na busca: {str(e)}")
 
 # Consultar por Período
 elif page == "Consultar por Período":
@@ -264,18 +440,27 @@ elif page == "Consultar por Período":
             end_timestamp = end_datetime.timestamp()
             
             if start_timestamp >= end_timestamp:
+                st.session_state.pop('period_query', None)
                 st.error("❌ A data/hora inicial dAntônio ser anterior à final.")
             else:
-                results = indexer.get_transactions_by_time_range(start_timestamp, end_timestamp)
-                
-                if results:
-                    st.success(f"✅ Encontradas {len(results)} transação(ões) no período!")
-                    
-                    for i, result in enumerate(results):
-                        with st.expander(f" Transação {i+1}", expanded=False):
-                            display_transaction(result)
-                else:
-                    st.warning("⚠️ Nenhuma transação encontrada no período especificado.")
+                st.session_state.period_query = (start_timestamp, end_timestamp)
+                st.session_state.period_page = 0
+        except Exception as e:
+            st.error(f"❌ Erro na busca: {str(e)}")
+    
+    if st.session_state.get('period_query'):
+        try:
+            start_timestamp, end_timestamp = st.session_state.period_query
+            
+            # Cursor do índice de timestamp: lê só a página atual
+            found = display_result_page(
+                lambda offset, limit: query_source.get_transactions_by_time_range_page(
+                    start_timestamp, end_timestamp, offset, limit
+                ),
+                "period_page", "das transações no período"
+            )
+            if not found:
+                st.warning("⚠️ Nenhuma transação encontrada no período especificado.")
         except Exception as e:
             st.error(f"❌ Erro na busca: {str(e)}")
 
@@ -285,48 +470,124 @@ elif page == "Consultar Saldo":
     
     address = st.text_input("Endereço", placeholder="Ex: Luiza")
     
+    # Consulta histórica opcional: saldo logo após um bloco específico
+    chain_height = indexer.get_chain_height()
+    at_height = st.number_input("Saldo na altura do bloco (opcional)", min_value=0,
+                                max_value=chain_height - 1, value=chain_height - 1, step=1)
+    
     if st.button("Consultar Saldo"):
         if address:
-            try:
-                balance = indexer.get_balance(address)
-                
-                if balance >= 0:
-                    st.success(f"✅ Saldo de **{address}**: **{balance:.2f}**")
-                else:
-                    st.warning(f" Saldo de **{address}**: **{balance:.2f}** (negativo)")
-                
-                # Mostrar histórico de transações
-                st.subheader(" Histórico de Transações")
-                
-                sent_transactions = indexer.get_transactions_by_sender(address)
-                received_transactions = indexer.get_transactions_by_receiver(address)
-                
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.write("** Transações Enviadas:**")
-                    if sent_transactions:
-                        for tx in sent_transactions:
-                            if isinstance(tx, dict) and 'transaction' in tx:
-                                t = tx['transaction']
-                                st.write(f"- {t['amount']:.2f} para {t['receiver']}")
-                    else:
-                        st.write("Nenhuma transação enviada.")
-                
-                with col2:
-                    st.write("** Transações Recebidas:**")
-                    if received_transactions:
-                        for tx in received_transactions:
-                            if isinstance(tx, dict) and 'transaction' in tx:
-                                t = tx['transaction']
-                                st.write(f"+ {t['amount']:.2f} de {t['sender'] or 'Sistema'}")
-                    else:
-                        st.write("Nenhuma transação recebida.")
+            # Guardar a consulta para que a troca de página não perca os resultados
+            st.session_state.balance_query = address
+            st.session_state.balance_sent_page = 0
+            st.session_state.balance_received_page = 0
+        else:
+            st.session_state.pop('balance_query', None)
+            st.error(" Por favor, informe o endereço.")
+    
+    if st.session_state.get('balance_query'):
+        address = st.session_state.balance_query
+        try:
+            balance = indexer.get_balance(address)
+            
+            if balance >= 0:
+                st.success(f"✅ Saldo de **{address}**: **{balance:.2f}**")
+            else:
+                st.warning(f" Saldo de **{address}**: **{balance:.2f}** (negativo)")
+            
+            if at_height < chain_height - 1:
+                historical_balance = indexer.get_balance_at(address, height=int(at_height))
+                st.info(f" Saldo de **{address}** no bloco {int(at_height)}: **{historical_balance:.2f}**")
+            
+            # Evolução do saldo a partir dos pontos de controle por bloco
+            balance_series = indexer.get_balance_series(address)
+            if len(balance_series) > 1:
+                st.subheader(" Evolução do Saldo")
+                series_df = pd.DataFrame(balance_series)
+                st.line_chart(series_df.rename(columns={'block_index': 'Bloco', 'balance': 'Saldo'})
+                              .set_index('Bloco')['Saldo'])
+            
+            # Histórico de transações, lido uma página por vez dos índices
+            st.subheader(" Histórico de Transações")
+            sent_tab, received_tab = st.tabs(["Transações Enviadas", "Transações Recebidas"])
+            
+            with sent_tab:
+                found = display_result_page(
+                    lambda offset, limit: indexer.get_transactions_by_sender_page(address, offset, limit),
+                    "balance_sent_page", "das transações enviadas"
+                )
+                if not found:
+                    st.write("Nenhuma transação enviada.")
+            
+            with received_tab:
+                found = display_result_page(
+                    lambda offset, limit: indexer.get_transactions_by_receiver_page(address, offset, limit),
+                    "balance_received_page", "das transações recebidas"
+                )
+                if not found:
+                    st.write("Nenhuma transação recebida.")
+            
+        except Exception as e:
+            st.error(f" Erro ao consultar saldo: {str(e)}")
+
+# Relações entre endereços (grafo de contrapartes)
+elif page == "Consultar Relações":
+    st.header("Consultar Relações entre Endereços")
+    
+    directions = {"Enviadas e recebidas": "both", "Enviadas": "out", "Recebidas": "in"}
+    
+    st.subheader(" Principais Contrapartes")
+    col1, col2 = st.columns(2)
+    with col1:
+        address = st.text_input("Endereço", placeholder="Ex: Luiza")
+    with col2:
+        direction_label = st.selectbox("Transferências", list(directions.keys()))
+    
+    if st.button("Buscar Contrapartes"):
+        if address:
+            counterparties = indexer.get_top_counterparties(address, n=20, direction=directions[direction_label])
+            if counterparties:
+                df = pd.DataFrame(counterparties)
+                df['last_seen'] = df['last_seen'].apply(format_timestamp)
+                st.dataframe(df.rename(columns={
+                    'address': 'Contraparte', 'sent': 'Enviado', 'received': 'Recebido',
+                    'transactions_count': 'Transações', 'volume': 'Volume', 'last_seen': 'Última Transação'
+                }), hide_index=True)
                 
-            except Exception as e:
-                st.error(f" Erro ao consultar saldo: {str(e)}")
+                connected = indexer.get_connected_addresses(address, max_hops=2, direction=directions[direction_label])
+                st.info(f" {len(connected)} endereço(s) a até 2 transferências de **{address}**.")
+            else:
+                st.warning(f" Nenhuma contraparte encontrada para **{address}**.")
         else:
             st.error(" Por favor, informe o endereço.")
+    
+    st.subheader(" Fluxo entre Dois Endereços")
+    col1, col2 = st.columns(2)
+    with col1:
+        address_a = st.text_input("Endereço A", placeholder="Ex: Luiza")
+    with col2:
+        address_b = st.text_input("Endereço B", placeholder="Ex: Rafael")
+    
+    if st.button("Consultar Fluxo"):
+        if address_a and address_b:
+            flow = indexer.get_flow_between(address_a, address_b)
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric(f"{address_a} → {address_b}", f"{flow['a_to_b']['volume']:.2f}",
+                          f"{flow['a_to_b']['transactions_count']} transação(ões)", delta_color="off")
+            with col2:
+                st.metric(f"{address_b} → {address_a}", f"{flow['b_to_a']['volume']:.2f}",
+                          f"{flow['b_to_a']['transactions_count']} transação(ões)", delta_color="off")
+            with col3:
+                st.metric("Saldo Líquido (A → B)", f"{flow['net']:.2f}")
+            
+            path = indexer.find_transfer_path(address_a, address_b)
+            if path:
+                st.info(" Caminho de transferências: " + " → ".join(path))
+            else:
+                st.warning(" Nenhum caminho de transferências de A até B em até 4 saltos.")
+        else:
+            st.error(" Por favor, informe os dois endereços.")
 
 # Dados de Demonstração
 elif page == "Dados de Demonstração":
@@ -336,8 +597,9 @@ elif page == "Dados de Demonstração":
     
     if st.button("Criar Dados de Demonstração"):
         try:
-            with st.spinner(" Criando dados de demonstração..."):
+            with st.spinner(" Criando dados de demonstração..."), indexer_lock.write():
                 result = indexer.populate_demo_data()
+                publisher.publish()
             
             st.success("Dados de demonstração criados com sucesso!")
             
@@ -374,44 +636,52 @@ elif page == "Visualizar Blockchain":
   
     
     try:
-        blockchain_data = indexer.get_full_blockchain()
+        height = indexer.get_chain_height()
+        pending_count = len(indexer.blockchain.mempool)
         
         st.subheader("Informações Gerais")
         col1, col2 = st.columns(2)
         
         with col1:
-            st.write(f"**Dificuldade:** {blockchain_data['difficulty']}")
-            st.write(f"**Recompensa de Mineração:** {blockchain_data['mining_reward']}")
+            st.write(f"**Dificuldade:** {indexer.blockchain.difficulty}")
+            st.write(f"**Recompensa de Mineração:** {indexer.blockchain.mining_reward}")
         
         with col2:
-            st.write(f"**Total de Blocos:** {len(blockchain_data['chain'])}")
-            st.write(f"**Transações Pendentes:** {len(blockchain_data['pending_transactions'])}")
+            st.write(f"**Total de Blocos:** {height}")
+            st.write(f"**Transações Pendentes:** {pending_count}")
+        
+        # Busca de blocos pelos índices de hash, altura e minerador
+        st.subheader(" Buscar Bloco")
+        block_query = st.text_input("Hash, altura ou minerador", placeholder="Ex: 3, 00ab12... ou Luiza")
+        if block_query:
+            query = block_query.strip()
+            if query.isdigit():
+                found_blocks = [indexer.get_block(int(query))]
+            else:
+                found_blocks = [indexer.get_block(query)]
+                if found_blocks[0] is None:
+                    found_blocks = indexer.get_blocks_by_miner(query, PAGE_SIZE)
+            found_blocks = [block for block in found_blocks if block]
+            
+            if found_blocks:
+                for block in found_blocks:
+                    display_block(block, expanded=len(found_blocks) == 1)
+            else:
+                st.warning(" Nenhum bloco encontrado.")
         
         st.subheader(" Cadeia de Blocos")
         
-        for block in blockchain_data['chain']:
-            with st.expander(f" Bloco {block['index']} - {block['hash'][:16]}...", expanded=False):
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.write(f"**Índice:** {block['index']}")
-                    st.write(f"**Timestamp:** {format_timestamp(block['timestamp'])}")
-                    st.write(f"**Hash Anterior:** {block['previous_hash'][:16]}...")
-                
-                with col2:
-                    st.write(f"**Hash:** {block['hash'][:16]}...")
-                    st.write(f"**Nonce:** {block['nonce']}")
-                    st.write(f"**Transações:** {len(block['transactions'])}")
-                
-                if block['transactions']:
-                    st.write("** Transações:**")
-                    for i, tx in enumerate(block['transactions']):
-                        st.write(f"{i+1}. {tx['transaction_id']}: {tx['sender']} → {tx['receiver']} ({tx['amount']})")
+        # Apenas a página atual é serializada (blocos mais recentes primeiro)
+        block_page = page_selector(height, PAGE_SIZE, "blocks_page")
+        for block in cached_blocks_page(indexer, indexer.blockchain.get_latest_block().hash, block_page, PAGE_SIZE):
+            display_block(block)
         
-        # Transações pendentes
-        if blockchain_data['pending_transactions']:
+        # Transações pendentes, paginadas como a cadeia
+        if pending_count:
             st.subheader(" Transações Pendentes")
-            for i, tx in enumerate(blockchain_data['pending_transactions']):
+            pending_page = page_selector(pending_count, PAGE_SIZE, "pending_page")
+            result_page = indexer.get_pending_transactions_page(pending_page * PAGE_SIZE, PAGE_SIZE)
+            for i, tx in enumerate(result_page['items'], start=result_page['offset']):
                 st.write(f"{i+1}. {tx['transaction_id']}: {tx['sender']} → {tx['receiver']} ({tx['amount']})")
     
     except Exception as e:
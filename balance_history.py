@@ -0,0 +1,63 @@
+from typing import List, Dict, Any, Optional
+import bisect
+
+
+class BalanceHistory:
+    """Índice de saldos históricos por endereço.
+
+    Para cada endereço guarda, em listas ordenadas, um ponto de controle
+    (altura, timestamp do bloco, saldo acumulado) por bloco que alterou seu
+    saldo. O saldo em uma altura ou instante qualquer é o último ponto de
+    controle até ali, encontrado por busca binária.
+    """
+
+    def __init__(self):
+        self.heights: Dict[str, List[int]] = {}
+        self.timestamps: Dict[str, List[float]] = {}
+        self.balances: Dict[str, List[float]] = {}
+
+    def add_block(self, block):
+        """Registra os novos saldos dos endereços movimentados em um bloco."""
+        deltas: Dict[str, float] = {}
+        for transaction in block.transactions:
+            if transaction.sender is not None:
+                deltas[transaction.sender] = deltas.get(transaction.sender, 0) - transaction.amount - transaction.fee
+            if transaction.receiver is not None:
+                deltas[transaction.receiver] = deltas.get(transaction.receiver, 0) + transaction.amount
+
+        for address, delta in deltas.items():
+            if address not in self.heights:
+                self.heights[address] = []
+                self.timestamps[address] = []
+                self.balances[address] = []
+            balances = self.balances[address]
+            self.heights[address].append(block.index)
+            self.timestamps[address].append(block.timestamp)
+            balances.append((balances[-1] if balances else 0) + delta)
+
+    def balance_at_height(self, address: str, height: int) -> float:
+        """Saldo do endereço após o bloco de altura height."""
+        heights = self.heights.get(address)
+        if not heights:
+            return 0
+        position = bisect.bisect_right(heights, height) - 1
+        return self.balances[address][position] if position >= 0 else 0
+
+    def balance_at_time(self, address: str, timestamp: float) -> float:
+        """Saldo do endereço considerando os blocos minerados até timestamp."""
+        timestamps = self.timestamps.get(address)
+        if not timestamps:
+            return 0
+        position = bisect.bisect_right(timestamps, timestamp) - 1
+        return self.balances[address][position] if position >= 0 else 0
+
+    def series(self, address: str) -> List[Dict[str, Any]]:
+        """Série de saldos do endereço, um ponto por bloco que o movimentou."""
+        return [
+            {'block_index': height, 'timestamp': timestamp, 'balance': balance}
+            for height, timestamp, balance in zip(
+                self.heights.get(address, []),
+                self.timestamps.get(address, []),
+                self.balances.get(address, [])
+            )
+        ]
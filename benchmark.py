@@ -0,0 +1,113 @@
+"""Benchmark dos motores de índice (btree, buffered_btree, hash, sorted_array).
+
+Mede, para cada tipo de chave usado pelo indexador, o tempo de inserção,
+busca exata, busca por intervalo e busca por prefixo, além da memória
+ocupada, e indica o motor vencedor de cada carga de trabalho.
+
+Uso: python benchmark.py [número de transações]
+"""
+import hashlib
+import random
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Any, Callable
+
+from blockchain_indexer import BlockchainIndexer
+from index_engines import INDEX_ENGINES, create_index
+
+
+def generate_keys(n: int) -> Dict[str, List[Any]]:
+    """Gera chaves no formato dos atributos indexados."""
+    rng = random.Random(42)
+    start = time.time()
+    return {
+        'transaction_id': [hashlib.sha256(str(i).encode()).hexdigest()[:16] for i in range(n)],
+        'timestamp': [start + i * 0.001 for i in range(n)],
+        'address': [f"user_{rng.randrange(n // 10 + 1):06d}" for _ in range(n)]
+    }
+
+
+def timed(function: Callable[[], Any]) -> float:
+    """Executa a função e retorna o tempo decorrido em segundos."""
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def check_results(engine: str, index, keys: List[Any], samples: int = 500):
+    """Confere buscas exatas contra uma varredura das chaves inseridas.
+    
+    Chaves repetidas (como endereços) precisam devolver todas as posições
+    em que foram inseridas, não apenas uma das cópias.
+    """
+    positions: Dict[Any, List[int]] = {}
+    for position, key in enumerate(keys):
+        positions.setdefault(key, []).append(position)
+    
+    for key in random.Random(11).sample(list(positions), min(samples, len(positions))):
+        value = index.search(key)
+        found = sorted(value) if isinstance(value, list) else [value]
+        if found != positions[key]:
+            raise AssertionError(f"{engine}: busca por {key!r} retornou {found}, esperado {positions[key]}")
+
+
+def run_workloads(engine: str, keys: List[Any], lookups: int = 2000) -> Dict[str, float]:
+    """Mede as cargas de trabalho de um motor sobre um conjunto de chaves."""
+    rng = random.Random(7)
+    results = {}
+
+    def build():
+        index = create_index(engine, **BlockchainIndexer.ENGINE_OPTIONS.get(engine, {}))
+        for position, key in enumerate(keys):
+            index.insert(key, position)
+        if hasattr(index, 'flush'):
+            index.flush()  # A inserção só termina quando o buffer chega à árvore
+        return index
+
+    start = time.perf_counter()
+    index = build()
+    results['inserção'] = time.perf_counter() - start
+    check_results(engine, index, keys)
+
+    # Memória medida em uma construção separada (o tracemalloc distorce o tempo)
+    tracemalloc.start()
+    copy = build()
+    results['memória (MB)'] = tracemalloc.get_traced_memory()[0] / 1e6
+    tracemalloc.stop()
+    del copy
+
+    probes = [rng.choice(keys) for _ in range(lookups)]
+    results['busca exata'] = timed(lambda: [index.search(key) for key in probes])
+
+    ordered = sorted(set(keys))
+    ranges = []
+    for _ in range(50):
+        first = rng.randrange(len(ordered))
+        ranges.append((ordered[first], ordered[min(first + 100, len(ordered) - 1)]))
+    results['intervalo'] = timed(lambda: [index.range_search(low, high) for low, high in ranges])
+
+    if isinstance(keys[0], str):
+        prefixes = [key[:len(key) - 4] for key in probes[:50]]
+        results['prefixo'] = timed(lambda: [index.prefix_search(prefix, 10) for prefix in prefixes])
+
+    return results
+
+
+def main(n: int = 20000):
+    keys_by_attribute = generate_keys(n)
+
+    for attribute, keys in keys_by_attribute.items():
+        print(f"\n=== {attribute} ({n} chaves) ===")
+        results = {engine: run_workloads(engine, keys) for engine in INDEX_ENGINES}
+        workloads = list(next(iter(results.values())).keys())
+
+        print(f"{'carga':<14}" + "".join(f"{engine:>16}" for engine in results) + f"{'vencedor':>16}")
+        for workload in workloads:
+            values = {engine: results[engine][workload] for engine in results}
+            winner = min(values, key=values.get)
+            print(f"{workload:<14}" + "".join(f"{value:>16.4f}" for value in values.values()) + f"{winner:>16}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
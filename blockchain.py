@@ -1,16 +1,88 @@
 import hashlib
-import json
+import struct
+import sys
 import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Callable
+from mempool import Mempool
+
+
+# Formatos binários (little-endian) usados para hash, persistência e transferência
+_STR_LEN = struct.Struct('<H')           # Prefixo de tamanho de strings
+_NO_STRING = 0xFFFF                      # Marca de string ausente (None)
+_TX_VALUES = struct.Struct('<ddd')       # amount, fee, timestamp
+_TX_CODES = struct.Struct('<II')         # Códigos de sender e receiver na AddressTable
+_NO_ADDRESS = 0xFFFFFFFF                 # Código de endereço ausente (None)
+_BLOCK_HEADER = struct.Struct('<QdQI')   # index, timestamp, nonce, número de transações
+_COUNT = struct.Struct('<I')
+
+
+def _pack_str(value: Optional[str]) -> bytes:
+    """Codifica uma string com prefixo de tamanho (None vira uma marca)."""
+    if value is None:
+        return _STR_LEN.pack(_NO_STRING)
+    encoded = value.encode()
+    return _STR_LEN.pack(len(encoded)) + encoded
+
+
+def _unpack_str(data: bytes, offset: int) -> Tuple[Optional[str], int]:
+    """Decodifica uma string gravada por _pack_str."""
+    (length,) = _STR_LEN.unpack_from(data, offset)
+    offset += _STR_LEN.size
+    if length == _NO_STRING:
+        return None, offset
+    return sys.intern(bytes(data[offset:offset + length]).decode()), offset + length
+
+
+class AddressTable:
+    """Tabela de endereços internados: cada endereço é gravado uma vez e referenciado por código."""
+    
+    __slots__ = ('addresses', 'codes')
+    
+    def __init__(self, addresses: Optional[List[str]] = None):
+        self.addresses: List[str] = list(addresses or [])
+        self.codes: Dict[str, int] = {address: code for code, address in enumerate(self.addresses)}
+    
+    def intern(self, address: Optional[str]) -> int:
+        """Retorna o código de um endereço, registrando-o se for novo."""
+        if address is None:
+            return _NO_ADDRESS
+        code = self.codes.get(address)
+        if code is None:
+            code = self.codes[address] = len(self.addresses)
+            self.addresses.append(address)
+        return code
+    
+    def lookup(self, code: int) -> Optional[str]:
+        """Retorna o endereço de um código."""
+        return None if code == _NO_ADDRESS else self.addresses[code]
+    
+    def to_bytes(self) -> bytes:
+        """Codifica a tabela de endereços."""
+        return _COUNT.pack(len(self.addresses)) + b''.join(_pack_str(address) for address in self.addresses)
+    
+    @classmethod
+    def from_bytes(cls, data: bytes, offset: int = 0) -> Tuple['AddressTable', int]:
+        """Decodifica uma tabela de endereços, retornando-a e o próximo offset."""
+        (count,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        addresses = []
+        for _ in range(count):
+            address, offset = _unpack_str(data, offset)
+            addresses.append(address)
+        return cls(addresses), offset
 
 
 class Transaction:
     """Representa uma transação no blockchain."""
     
-    def __init__(self, sender: str, receiver: str, amount: float, transaction_id: str = None):
-        self.sender = sender
-        self.receiver = receiver
+    __slots__ = ('sender', 'receiver', 'amount', 'fee', 'timestamp', 'transaction_id')
+    
+    def __init__(self, sender: str, receiver: str, amount: float, transaction_id: str = None, fee: float = 0.0):
+        # Endereços internados: as repetições compartilham a mesma string
+        self.sender = sys.intern(sender) if sender is not None else None
+        self.receiver = sys.intern(receiver) if receiver is not None else None
         self.amount = amount
+        self.fee = fee  # Taxa paga ao minerador; define a prioridade no mempool
         self.timestamp = time.time()
         self.transaction_id = transaction_id or self._generate_transaction_id()
     
@@ -26,9 +98,47 @@ class Transaction:
             'sender': self.sender,
             'receiver': self.receiver,
             'amount': self.amount,
+            'fee': self.fee,
             'timestamp': self.timestamp
         }
     
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Transaction':
+        """Reconstrói uma transação a partir de to_dict (preservando ID e timestamp)."""
+        transaction = cls(data['sender'], data['receiver'], data['amount'],
+                          data['transaction_id'], data.get('fee', 0.0))
+        transaction.timestamp = data['timestamp']
+        return transaction
+    
+    def to_bytes(self, table: Optional[AddressTable] = None) -> bytes:
+        """Codifica a transação em binário.
+        
+        Sem tabela, os endereços são gravados por extenso (formato autocontido,
+        usado no hash); com tabela, apenas seus códigos (formato de armazenamento).
+        """
+        if table is None:
+            addresses = _pack_str(self.sender) + _pack_str(self.receiver)
+        else:
+            addresses = _TX_CODES.pack(table.intern(self.sender), table.intern(self.receiver))
+        return _pack_str(self.transaction_id) + addresses + _TX_VALUES.pack(self.amount, self.fee, self.timestamp)
+    
+    @classmethod
+    def from_bytes(cls, data: bytes, offset: int = 0,
+                   table: Optional[AddressTable] = None) -> Tuple['Transaction', int]:
+        """Decodifica uma transação, retornando-a e o próximo offset."""
+        transaction = cls.__new__(cls)
+        transaction.transaction_id, offset = _unpack_str(data, offset)
+        if table is None:
+            transaction.sender, offset = _unpack_str(data, offset)
+            transaction.receiver, offset = _unpack_str(data, offset)
+        else:
+            sender_code, receiver_code = _TX_CODES.unpack_from(data, offset)
+            offset += _TX_CODES.size
+            transaction.sender = table.lookup(sender_code)
+            transaction.receiver = table.lookup(receiver_code)
+        transaction.amount, transaction.fee, transaction.timestamp = _TX_VALUES.unpack_from(data, offset)
+        return transaction, offset + _TX_VALUES.size
+    
     def __str__(self):
         return f"Transaction({self.transaction_id}: {self.sender} -> {self.receiver}, {self.amount})"
 
@@ -36,6 +146,8 @@ class Transaction:
 class Block:
     """Representa um bloco no blockchain."""
     
+    __slots__ = ('index', 'timestamp', 'transactions', 'previous_hash', 'nonce', 'hash')
+    
     def __init__(self, index: int, transactions: List[Transaction], previous_hash: str):
         self.index = index
         self.timestamp = time.time()
@@ -44,23 +156,28 @@ class Block:
         self.nonce = 0
         self.hash = self._calculate_hash()
     
-    def _calculate_hash(self) -> str:
-        """Calcula o hash do bloco."""
-        block_string = json.dumps({
-            'index': self.index,
-            'timestamp': self.timestamp,
-            'transactions': [tx.to_dict() for tx in self.transactions],
-            'previous_hash': self.previous_hash,
-            'nonce': self.nonce
-        }, sort_keys=True)
-        return hashlib.sha256(block_string.encode()).hexdigest()
+    def _transactions_digest(self) -> bytes:
+        """Calcula o digest da codificação binária das transações."""
+        digest = hashlib.sha256()
+        for transaction in self.transactions:
+            digest.update(transaction.to_bytes())
+        return digest.digest()
+    
+    def _calculate_hash(self, transactions_digest: Optional[bytes] = None) -> str:
+        """Calcula o hash do bloco a partir do cabeçalho binário e do digest das transações."""
+        if transactions_digest is None:
+            transactions_digest = self._transactions_digest()
+        header = _BLOCK_HEADER.pack(self.index, self.timestamp, self.nonce, len(self.transactions))
+        return hashlib.sha256(header + _pack_str(self.previous_hash) + transactions_digest).hexdigest()
     
     def mine_block(self, difficulty: int = 4):
         """Simula a mineração do bloco (Proof of Work simples)."""
         target = "0" * difficulty
+        # As transações não mudam durante a mineração: o digest é calculado uma vez
+        transactions_digest = self._transactions_digest()
         while self.hash[:difficulty] != target:
             self.nonce += 1
-            self.hash = self._calculate_hash()
+            self.hash = self._calculate_hash(transactions_digest)
         print(f"Bloco minerado: {self.hash}")
     
     def to_dict(self) -> Dict[str, Any]:
@@ -73,16 +190,73 @@ class Block:
             'nonce': self.nonce,
             'hash': self.hash
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], transactions: Optional[List[Transaction]] = None) -> 'Block':
+        """Reconstrói um bloco a partir de to_dict, sem recalcular hash nem minerar."""
+        block = cls.__new__(cls)
+        block.index = data['index']
+        block.timestamp = data['timestamp']
+        block.previous_hash = data['previous_hash']
+        block.nonce = data['nonce']
+        block.hash = data['hash']
+        if transactions is None:
+            transactions = [Transaction.from_dict(tx) for tx in data['transactions']]
+        block.transactions = transactions
+        return block
+    
+    def to_bytes(self, table: Optional[AddressTable] = None) -> bytes:
+        """Codifica o bloco em binário (veja Transaction.to_bytes)."""
+        header = _BLOCK_HEADER.pack(self.index, self.timestamp, self.nonce, len(self.transactions))
+        return (header + _pack_str(self.previous_hash) + _pack_str(self.hash)
+                + b''.join(transaction.to_bytes(table) for transaction in self.transactions))
+    
+    @classmethod
+    def from_bytes(cls, data: bytes, offset: int = 0,
+                   table: Optional[AddressTable] = None) -> Tuple['Block', int]:
+        """Decodifica um bloco, retornando-o e o próximo offset."""
+        block = cls.__new__(cls)
+        block.index, block.timestamp, block.nonce, count = _BLOCK_HEADER.unpack_from(data, offset)
+        offset += _BLOCK_HEADER.size
+        block.previous_hash, offset = _unpack_str(data, offset)
+        block.hash, offset = _unpack_str(data, offset)
+        block.transactions = []
+        for _ in range(count):
+            transaction, offset = Transaction.from_bytes(data, offset, table)
+            block.transactions.append(transaction)
+        return block, offset
 
 
 class Blockchain:
     """Implementa um blockchain simplificado."""
     
-    def __init__(self):
+    # Cabeçalho do arquivo binário: assinatura, versão, difficulty, mining_reward
+    FILE_MAGIC = b'BTIX'
+    FILE_HEADER = struct.Struct('<4sBId')
+    FILE_VERSION = 1
+    
+    def __init__(self, max_pending: int = 10000, max_block_transactions: Optional[int] = None,
+                 chain: Optional[List[Block]] = None):
         self.difficulty = 2
-        self.pending_transactions: List[Transaction] = []
+        self.mempool = Mempool(max_size=max_pending)
+        self.max_block_transactions = max_block_transactions  # None = todas as pendentes
         self.mining_reward = 12
-        self.chain: List[Block] = [self._create_genesis_block()]
+        self.balances: Dict[str, float] = {}  # Saldos confirmados, atualizados a cada bloco
+        # Consulta de IDs já confirmados na cadeia (o indexador fornece a do seu índice de IDs)
+        self.confirmed_lookup: Optional[Callable[[str], bool]] = None
+        # Uma cadeia existente (por exemplo, carregada de disco) dispensa o bloco gênese
+        self.chain: List[Block] = chain if chain is not None else [self._create_genesis_block()]
+        for block in self.chain:
+            self._apply_block(block)
+        # Validade mantida como estado: blocos até validated_height já foram
+        # verificados; os recebidos no construtor são verificados sob demanda
+        self.valid = True
+        self.validated_height = 1
+    
+    @property
+    def pending_transactions(self) -> List[Transaction]:
+        """Transações pendentes em ordem de chegada."""
+        return list(self.mempool)
     
     def _create_genesis_block(self) -> Block:
         """Cria o bloco gênese."""
@@ -95,62 +269,177 @@ class Blockchain:
         """Retorna o último bloco da cadeia."""
         return self.chain[-1]
     
-    def add_transaction(self, transaction: Transaction):
-        """Adiciona uma transação à lista de transações pendentes, validando saldo do remetente."""
+    def get_available_balance(self, address: str) -> float:
+        """Saldo confirmado menos o que o endereço já comprometeu no mempool."""
+        return self.get_balance(address) - self.mempool.get_pending_spend(address)
+    
+    def add_transaction(self, transaction: Transaction) -> Optional[Transaction]:
+        """Adiciona uma transação ao mempool, validando saldo do remetente.
+        
+        Retorna a transação despejada do mempool para abrir espaço (ou None).
+        """
+        if self.is_confirmed(transaction.transaction_id):
+            raise Exception("Transação já confirmada na cadeia.")
         if transaction.sender is not None:
-            if self.get_balance(transaction.sender) < transaction.amount:
+            if self.get_available_balance(transaction.sender) < transaction.amount + transaction.fee:
                 raise Exception("Saldo insuficiente para realizar a transação.")
-        self.pending_transactions.append(transaction)
+        return self.mempool.add(transaction)
+    
+    def is_confirmed(self, transaction_id: str) -> bool:
+        """Verifica se um ID de transação já está em um bloco da cadeia."""
+        return self.confirmed_lookup is not None and self.confirmed_lookup(transaction_id)
+    
+    def add_transactions(self, transactions: List[Transaction]) -> Dict[str, Any]:
+        """Adiciona um lote de transações validando-o contra um único snapshot de saldos.
+        
+        Transações inválidas são rejeitadas individualmente sem interromper o lote.
+        """
+        available: Dict[str, float] = {}  # Snapshot dos saldos disponíveis dos remetentes do lote
+        accepted: List[str] = []
+        rejected: List[Tuple[str, str]] = []
+        evicted: List[str] = []
+        
+        for transaction in transactions:
+            if self.is_confirmed(transaction.transaction_id):
+                rejected.append((transaction.transaction_id, "Transação já confirmada na cadeia."))
+                continue
+            sender = transaction.sender
+            cost = transaction.amount + transaction.fee
+            if sender is not None:
+                if sender not in available:
+                    available[sender] = self.get_available_balance(sender)
+                if available[sender] < cost:
+                    rejected.append((transaction.transaction_id, "Saldo insuficiente para realizar a transação."))
+                    continue
+            
+            try:
+                evicted_transaction = self.mempool.add(transaction)
+            except Exception as e:
+                rejected.append((transaction.transaction_id, str(e)))
+                continue
+            
+            if sender is not None:
+                available[sender] -= cost
+            if evicted_transaction is not None:
+                evicted.append(evicted_transaction.transaction_id)
+                # O gasto despejado volta a ficar disponível para o remetente
+                if evicted_transaction.sender in available:
+                    available[evicted_transaction.sender] += evicted_transaction.amount + evicted_transaction.fee
+            accepted.append(transaction.transaction_id)
+        
+        return {
+            'accepted': accepted,
+            'rejected': rejected,
+            'evicted': evicted
+        }
     
     def mine_pending_transactions(self, mining_reward_address: str):
-        """Minera as transações pendentes e cria um novo bloco."""
-        # Adiciona a recompensa de mineração
-        reward_transaction = Transaction(None, mining_reward_address, self.mining_reward)
-        self.pending_transactions.append(reward_transaction)
+        """Minera as transações pendentes de maior prioridade e cria um novo bloco."""
+        selected = self.mempool.select(self.max_block_transactions)
+        
+        # Adiciona a recompensa de mineração (acrescida das taxas do bloco)
+        fees = sum(transaction.fee for transaction in selected)
+        reward_transaction = Transaction(None, mining_reward_address, self.mining_reward + fees)
         
         # Cria um novo bloco
         block = Block(
             len(self.chain),
-            self.pending_transactions,
+            selected + [reward_transaction],
             self.get_latest_block().hash
         )
         block.mine_block(self.difficulty)
         
         # Adiciona o bloco à cadeia
         self.chain.append(block)
+        self._apply_block(block)
         
-        # Limpa as transações pendentes
-        self.pending_transactions = []
+        # Remove do mempool as transações incluídas no bloco
+        self.mempool.remove_many(selected)
+        self._mark_validated(block)
         
         return block
     
+    def append_block(self, block: Block):
+        """Acrescenta um bloco já minerado (por exemplo, importado de outro nó), validando-o."""
+        latest = self.get_latest_block()
+        if block.index != len(self.chain):
+            raise Exception(f"Índice de bloco inesperado: {block.index} (esperado {len(self.chain)}).")
+        if block.previous_hash != latest.hash:
+            raise Exception(f"Bloco {block.index} não aponta para o hash do bloco anterior.")
+        if block.hash != block._calculate_hash() or not block.hash.startswith("0" * self.difficulty):
+            raise Exception(f"Hash inválido no bloco {block.index}.")
+        transaction_ids = set()
+        for transaction in block.transactions:
+            if transaction.transaction_id in transaction_ids or self.is_confirmed(transaction.transaction_id):
+                raise Exception(f"Transação {transaction.transaction_id} do bloco {block.index} já está confirmada.")
+            transaction_ids.add(transaction.transaction_id)
+        
+        self.chain.append(block)
+        self._apply_block(block)
+        
+        # Transações do bloco que estavam pendentes neste nó não podem ser mineradas de novo
+        self.mempool.remove_many(block.transactions)
+        self._mark_validated(block)
+    
+    def _mark_validated(self, block: Block):
+        """Registra um bloco validado ao entrar na cadeia (evita revalidá-lo em is_valid)."""
+        if self.validated_height == block.index:
+            self.validated_height += 1
+    
+    def _apply_block(self, block: Block):
+        """Atualiza os saldos confirmados com as transações de um bloco."""
+        for transaction in block.transactions:
+            if transaction.sender is not None:
+                self.balances[transaction.sender] = (
+                    self.balances.get(transaction.sender, 0) - transaction.amount - transaction.fee
+                )
+            if transaction.receiver is not None:
+                self.balances[transaction.receiver] = (
+                    self.balances.get(transaction.receiver, 0) + transaction.amount
+                )
+    
     def get_balance(self, address: str) -> float:
-        """Calcula o saldo de um endereço."""
-        balance = 0
+        """Retorna o saldo confirmado de um endereço."""
+        return self.balances.get(address, 0)
+    
+    def _is_block_valid(self, i: int) -> bool:
+        """Verifica o hash do bloco i e seu encadeamento com o anterior."""
+        current_block = self.chain[i]
+        previous_block = self.chain[i - 1]
         
-        for block in self.chain:
-            for transaction in block.transactions:
-                if transaction.sender == address:
-                    balance -= transaction.amount
-                if transaction.receiver == address:
-                    balance += transaction.amount
+        if current_block.hash != current_block._calculate_hash():
+            return False
         
-        return balance
+        return current_block.previous_hash == previous_block.hash
     
     def is_chain_valid(self) -> bool:
-        """Valida a integridade da cadeia de blocos."""
-        for i in range(1, len(self.chain)):
-            current_block = self.chain[i]
-            previous_block = self.chain[i - 1]
-            
-            if current_block.hash != current_block._calculate_hash():
-                return False
-            
-            if current_block.previous_hash != previous_block.hash:
-                return False
+        """Valida a integridade da cadeia de blocos, recalculando todos os hashes.
         
+        Também rejeita cadeias em que um mesmo ID de transação aparece mais de uma vez.
+        """
+        if not all(self._is_block_valid(i) for i in range(1, len(self.chain))):
+            return False
+        transaction_ids = set()
+        for block in self.chain:
+            for transaction in block.transactions:
+                if transaction.transaction_id in transaction_ids:
+                    return False
+                transaction_ids.add(transaction.transaction_id)
         return True
     
+    def is_valid(self) -> bool:
+        """Validade da cadeia, verificando apenas os blocos ainda não verificados.
+        
+        Blocos minerados ou acrescentados por append_block já entram
+        validados, então o custo por chamada é O(1) no uso normal.
+        """
+        while self.valid and self.validated_height < len(self.chain):
+            if self._is_block_valid(self.validated_height):
+                self.validated_height += 1
+            else:
+                self.valid = False
+        return self.valid
+    
     def get_all_transactions(self) -> List[Transaction]:
         """Retorna todas as transações da cadeia."""
         all_transactions = []
@@ -158,12 +447,54 @@ class Blockchain:
             all_transactions.extend(block.transactions)
         return all_transactions
     
+    def to_bytes(self) -> bytes:
+        """Codifica a cadeia confirmada no formato binário de armazenamento.
+        
+        Os endereços são gravados uma única vez na AddressTable e os blocos
+        referenciam apenas seus códigos.
+        """
+        table = AddressTable()
+        blocks = b''.join(block.to_bytes(table) for block in self.chain)
+        header = self.FILE_HEADER.pack(self.FILE_MAGIC, self.FILE_VERSION, self.difficulty, self.mining_reward)
+        return header + table.to_bytes() + _COUNT.pack(len(self.chain)) + blocks
+    
+    @classmethod
+    def from_bytes(cls, data: bytes, **kwargs) -> 'Blockchain':
+        """Reconstrói um blockchain a partir de Blockchain.to_bytes."""
+        magic, version, difficulty, mining_reward = cls.FILE_HEADER.unpack_from(data, 0)
+        if magic != cls.FILE_MAGIC or version != cls.FILE_VERSION:
+            raise ValueError("Formato de arquivo de blockchain inválido.")
+        table, offset = AddressTable.from_bytes(data, cls.FILE_HEADER.size)
+        (count,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        
+        chain = []
+        for _ in range(count):
+            block, offset = Block.from_bytes(data, offset, table)
+            chain.append(block)
+        
+        blockchain = cls(chain=chain, **kwargs)
+        blockchain.difficulty = difficulty
+        blockchain.mining_reward = mining_reward
+        return blockchain
+    
+    def save(self, path: str):
+        """Grava a cadeia em disco no formato binário."""
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+    
+    @classmethod
+    def load(cls, path: str, **kwargs) -> 'Blockchain':
+        """Carrega uma cadeia gravada por save."""
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read(), **kwargs)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Converte o blockchain para um dicionário."""
         return {
             'chain': [block.to_dict() for block in self.chain],
             'difficulty': self.difficulty,
-            'pending_transactions': [tx.to_dict() for tx in self.pending_transactions],
+            'pending_transactions': [tx.to_dict() for tx in self.mempool],
             'mining_reward': self.mining_reward
         }
 
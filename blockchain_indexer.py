@@ -1,30 +1,150 @@
 from blockchain import Blockchain, Transaction
-from btree import BTree
-from typing import List, Dict, Any, Optional
+from index_engines import create_index, insert_many
+from partitions import PartitionManager
+from balance_history import BalanceHistory
+from counterparty import CounterpartyGraph
+from aggregates import AggregateStore
+from analytics import ColumnarAnalytics
+from typing import List, Dict, Any, Optional, Iterator, Iterable
+from itertools import islice
 import time
 
 
+def read_page(cursor: Iterator[Dict[str, Any]], offset: int, limit: int) -> Dict[str, Any]:
+    """Lê uma página de um cursor consumindo apenas offset + limit + 1 itens."""
+    items = list(islice(cursor, offset, offset + limit + 1))
+    return {
+        'items': items[:limit],
+        'offset': offset,
+        'has_more': len(items) > limit
+    }
+
+
 class BlockchainIndexer:
     """Integra o blockchain com indexação B-tree."""
     
-    def __init__(self):
-        self.blockchain = Blockchain()
+    # Motor de índice por atributo. O ID de transação só é consultado por
+    # igualdade, então usa o índice hash; os demais precisam de ordem. O
+    # timestamp recebe chaves sempre novas a cada bloco, então acumula as
+    # inserções em memória e as aplica à árvore em lotes.
+    DEFAULT_INDEX_ENGINES = {
+        'transaction_id': 'hash',
+        'transaction_id_prefix': None,     # Índice ordenado opcional para prefixos de ID (veja abaixo)
+        'timestamp': 'buffered_btree',
+        'sender': 'btree',
+        'receiver': 'btree',
+        'block_hash': 'hash',              # Hash do bloco -> altura
+        'miner': 'btree',                  # Endereço de recompensa -> alturas
+        'block_timestamp': 'sorted_array'  # Timestamp do bloco -> altura (sempre crescente)
+    }
+    
+    # Blocos indexados por lote em import_blocks (limita a memória extra da importação)
+    IMPORT_BATCH_BLOCKS = 1000
+    
+    # Opções de construção de cada motor
+    ENGINE_OPTIONS = {
+        'btree': {'max_keys': 10},
+        'buffered_btree': {'max_keys': 10, 'buffer_size': 1024},
+        'hash': {},
+        'sorted_array': {}
+    }
+    
+    def __init__(self, blockchain: Optional[Blockchain] = None, index_engines: Optional[Dict[str, str]] = None,
+                 partition_blocks: int = 1000, partition_seconds: Optional[float] = None,
+                 hot_partitions: int = 4, cold_storage_dir: Optional[str] = None):
+        # Um blockchain existente (por exemplo, carregado de disco) é indexado por completo
+        self.blockchain = blockchain if blockchain is not None else Blockchain()
+        
+        # Índices para diferentes tipos de consulta (motor configurável por atributo)
+        self.index_engines = dict(self.DEFAULT_INDEX_ENGINES, **(index_engines or {}))
+        self.transaction_id_index = self._create_index('transaction_id')  # Índice por ID de transação
+        
+        # Buscas por prefixo de ID usam o próprio índice de IDs: com o hash,
+        # varrem a tabela (O(n), sem memória extra). Um motor ordenado em
+        # 'transaction_id_prefix' cria um segundo índice, logarítmico, ao
+        # custo de guardar cada ID duas vezes
+        if self.index_engines['transaction_id_prefix'] and not getattr(self.transaction_id_index, 'ordered', True):
+            self.transaction_id_prefix_index = self._create_index('transaction_id_prefix')
+        else:
+            self.transaction_id_prefix_index = self.transaction_id_index
+        
+        # Timestamp, remetente e destinatário são particionados por faixa de
+        # blocos (ou janela de tempo); partições fechadas são congeladas e
+        # podem ir para disco, e as consultas podam as que não se sobrepõem
+        self.partitions = PartitionManager(
+            self._create_index,
+            partition_blocks=partition_blocks,
+            partition_seconds=partition_seconds,
+            hot_partitions=hot_partitions,
+            cold_storage_dir=cold_storage_dir,
+            chain_id=self.blockchain.chain[0].hash[:12]  # Início do hash gênese, como nas réplicas
+        )
+        self.timestamp_index = self.partitions.view('timestamp')  # Índice por timestamp
+        self.sender_index = self.partitions.view('sender')        # Índice por remetente
+        self.receiver_index = self.partitions.view('receiver')    # Índice por destinatário
+        
+        # Índices de blocos (valores são alturas na cadeia)
+        self.block_hash_index = self._create_index('block_hash')
+        self.miner_index = self._create_index('miner')
+        self.block_timestamp_index = self._create_index('block_timestamp')
+        
+        # Agregados por bloco e por janela de tempo para o dashboard
+        self.aggregates = AggregateStore()
+        
+        # Visão colunar (NumPy) para análises entre endereços
+        self.analytics = ColumnarAnalytics()
         
-        # Índices B-tree para diferentes tipos de consulta
-        self.transaction_id_index = BTree(max_keys=10)  # Índice por ID de transação
-        self.timestamp_index = BTree(max_keys=10)       # Índice por timestamp
-        self.sender_index = BTree(max_keys=10)          # Índice por remetente
-        self.receiver_index = BTree(max_keys=10)        # Índice por destinatário
+        # Pontos de controle de saldo por endereço para consultas históricas
+        self.balance_history = BalanceHistory()
         
-        # Indexar o bloco gênese
-        self._index_block(self.blockchain.chain[0])
+        # Grafo de contrapartes (quem transacionou com quem, quanto e quando)
+        self.counterparties = CounterpartyGraph()
+        
+        # IDs de blocos já acrescentados à cadeia e ainda não indexados (lote de import_blocks)
+        self._unindexed_ids: set = set()
+        self.blockchain.confirmed_lookup = self.is_transaction_confirmed
+        
+        # Indexar o bloco gênese (e os demais, se a cadeia já existir)
+        chain = self.blockchain.chain
+        for start in range(0, len(chain), self.IMPORT_BATCH_BLOCKS):
+            self._index_blocks(chain[start:start + self.IMPORT_BATCH_BLOCKS])
+    
+    def is_transaction_confirmed(self, transaction_id: str) -> bool:
+        """Verifica se o ID já está em um bloco da cadeia (consulta ao índice de IDs)."""
+        return transaction_id in self._unindexed_ids or self.transaction_id_index.search(transaction_id) is not None
     
-    def add_transaction(self, sender: str, receiver: str, amount: float) -> str:
+    def _create_index(self, attribute: str):
+        """Cria o índice de um atributo com o motor configurado."""
+        engine = self.index_engines[attribute]
+        return create_index(engine, **self.ENGINE_OPTIONS.get(engine, {}))
+    
+    def add_transaction(self, sender: str, receiver: str, amount: float, fee: float = 0.0) -> str:
         """Adiciona uma nova transação ao blockchain."""
-        transaction = Transaction(sender, receiver, amount)
+        transaction = Transaction(sender, receiver, amount, fee=fee)
         self.blockchain.add_transaction(transaction)
         return transaction.transaction_id
     
+    def add_transactions(self, batch: List[tuple]) -> Dict[str, Any]:
+        """Adiciona um lote de transações (sender, receiver, amount[, fee]) de uma só vez."""
+        transactions = [
+            Transaction(item[0], item[1], item[2], fee=item[3] if len(item) > 3 else 0.0)
+            for item in batch
+        ]
+        return self.blockchain.add_transactions(transactions)
+    
+    def get_pending_transaction(self, transaction_id: str) -> Optional[Dict[str, Any]]:
+        """Busca uma transação pendente por ID no índice hash do mempool."""
+        transaction = self.blockchain.mempool.get(transaction_id)
+        return transaction.to_dict() if transaction else None
+    
+    def get_pending_transactions_by_address(self, address: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Retorna as transações pendentes enviadas e recebidas por um endereço."""
+        mempool = self.blockchain.mempool
+        return {
+            'sent': [tx.to_dict() for tx in mempool.get_by_sender(address)],
+            'received': [tx.to_dict() for tx in mempool.get_by_receiver(address)]
+        }
+    
     def mine_block(self, miner_address: str, miner_name: str = "") -> Dict[str, Any]:
         """Minera um novo bloco e atualiza os índices. miner_name é opcional."""
         # Minerar o bloco
@@ -43,90 +163,263 @@ class BlockchainIndexer:
             result['miner_name'] = miner_name
         return result
     
+    def import_blocks(self, blocks: Iterable, batch_size: Optional[int] = None) -> int:
+        """Acrescenta e indexa blocos já minerados, em lotes de batch_size blocos.
+        
+        Cada bloco é validado e acrescentado à cadeia assim que é lido; os
+        índices recebem os blocos de um lote de uma vez (_index_blocks), então
+        a memória extra é limitada ao lote, e não ao tamanho da entrada.
+        Blocos com altura já presente na cadeia são ignorados. Retorna o
+        número de blocos importados.
+        """
+        batch_size = batch_size or self.IMPORT_BATCH_BLOCKS
+        imported = 0
+        batch = []
+        try:
+            for block in blocks:
+                if block.index < len(self.blockchain.chain):
+                    continue
+                self.blockchain.append_block(block)
+                self._unindexed_ids.update(transaction.transaction_id for transaction in block.transactions)
+                batch.append(block)
+                if len(batch) >= batch_size:
+                    self._index_blocks(batch)
+                    imported += len(batch)
+                    batch = []
+                    self._unindexed_ids.clear()
+        finally:
+            # Blocos já acrescentados são indexados mesmo se um bloco seguinte for inválido
+            try:
+                if batch:
+                    self._index_blocks(batch)
+                    imported += len(batch)
+            finally:
+                self._unindexed_ids.clear()
+        return imported
+    
     def _index_block(self, block):
         """Indexa todas as transações de um bloco."""
-        for transaction in block.transactions:
-            # Indexar por ID de transação
-            self.transaction_id_index.insert(
-                transaction.transaction_id, 
-                {
-                    'block_index': block.index,
-                    'transaction': transaction.to_dict()
-                }
-            )
-            
-            # Indexar por timestamp
-            self.timestamp_index.insert(
-                transaction.timestamp,
-                {
-                    'block_index': block.index,
-                    'transaction': transaction.to_dict()
-                }
-            )
-            
-            # Indexar por remetente (se não for None)
-            if transaction.sender:
-                self.sender_index.insert(
-                    transaction.sender,
-                    {
-                        'block_index': block.index,
-                        'transaction': transaction.to_dict()
-                    }
-                )
-            
-            # Indexar por destinatário
-            if transaction.receiver:
-                self.receiver_index.insert(
-                    transaction.receiver,
-                    {
-                        'block_index': block.index,
-                        'transaction': transaction.to_dict()
-                    }
-                )
+        self._index_blocks([block])
+    
+    def _index_blocks(self, blocks: List):
+        """Indexa uma sequência de blocos consecutivos, com inserções em lote em cada índice."""
+        # Uma única entrada compacta (altura, transação) é compartilhada pelos
+        # índices; o dicionário só é montado quando a transação é consultada
+        id_items = [
+            (transaction.transaction_id, (block.index, transaction))
+            for block in blocks
+            for transaction in block.transactions
+        ]
+        insert_many(self.transaction_id_index, id_items)
+        if self.transaction_id_prefix_index is not self.transaction_id_index:
+            insert_many(self.transaction_id_prefix_index, id_items)
+        
+        # Indexar por timestamp, remetente e destinatário nas partições
+        self.partitions.add_blocks(blocks)
+        
+        # Indexar os próprios blocos por hash, minerador e timestamp
+        insert_many(self.block_hash_index, [(block.hash, block.index) for block in blocks])
+        insert_many(self.block_timestamp_index, [(block.timestamp, block.index) for block in blocks])
+        miners = [(self._get_block_miner(block), block.index) for block in blocks]
+        insert_many(self.miner_index, [(miner, height) for miner, height in miners if miner])
+        
+        # Atualizar os agregados e a visão colunar incrementalmente
+        for block in blocks:
+            self.aggregates.add_block(block)
+            self.analytics.add_block(block)
+            self.balance_history.add_block(block)
+            self.counterparties.add_block(block)
+    
+    @staticmethod
+    def _get_block_miner(block) -> Optional[str]:
+        """Retorna o endereço que recebeu a recompensa do bloco (transação sem remetente)."""
+        for transaction in reversed(block.transactions):
+            if transaction.sender is None:
+                return transaction.receiver
+        return None
+    
+    def get_block(self, block_id) -> Optional[Dict[str, Any]]:
+        """Retorna um único bloco pela altura (int) ou pelo hash (str)."""
+        if isinstance(block_id, str):
+            height = self.block_hash_index.search(block_id)
+            if height is None:
+                return None
+        else:
+            height = block_id
+        
+        if not 0 <= height < len(self.blockchain.chain):
+            return None
+        return self.blockchain.chain[height].to_dict()
+    
+    def _heights(self, value) -> List[int]:
+        """Converte o valor de um índice de blocos (altura ou lista de alturas) em lista."""
+        if value is None:
+            return []
+        return value if isinstance(value, list) else [value]
+    
+    def get_blocks_by_miner(self, miner_address: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Retorna os blocos minerados por um endereço (mais recentes primeiro)."""
+        heights = self._heights(self.miner_index.search(miner_address))[::-1]
+        return [self.blockchain.chain[height].to_dict() for height in heights[:limit]]
+    
+    def get_blocks_by_time_range(self, start_time: float, end_time: float) -> List[Dict[str, Any]]:
+        """Retorna os blocos minerados em um intervalo de tempo."""
+        return [
+            self.blockchain.chain[height].to_dict()
+            for _, value in self.block_timestamp_index.iter_range(start_time, end_time)
+            for height in self._heights(value)
+        ]
+    
+    @staticmethod
+    def _to_result(entry) -> Dict[str, Any]:
+        """Converte uma entrada de índice (block_index, transaction) no formato de resposta."""
+        block_index, transaction = entry
+        return {
+            'block_index': block_index,
+            'transaction': transaction.to_dict()
+        }
+    
+    def _to_results(self, value) -> List[Dict[str, Any]]:
+        """Converte o valor de uma chave do índice (entrada única ou lista) em uma lista de respostas."""
+        if value is None:
+            return []
+        
+        # Se há múltiplas transações com a mesma chave
+        if isinstance(value, list):
+            return [self._to_result(entry) for entry in value]
+        else:
+            return [self._to_result(value)]
     
     def get_transaction_by_id(self, transaction_id: str) -> Optional[Dict[str, Any]]:
-        """Busca uma transação por ID usando o índice B-tree."""
+        """Busca uma transação por ID usando o índice configurado (hash por padrão)."""
         result = self.transaction_id_index.search(transaction_id)
-        return result
+        if result is None:
+            return None
+        if isinstance(result, list):
+            return [self._to_result(entry) for entry in result]
+        return self._to_result(result)
+    
+    def search_transactions_by_id_prefix(self, prefix: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Busca transações cujo ID começa com prefix (IDs truncados colados pelo usuário).
+        
+        É logarítmica com um índice de IDs ordenado; com o hash padrão e sem
+        'transaction_id_prefix' configurado, varre a tabela.
+        """
+        results = []
+        for _, value in self.transaction_id_prefix_index.prefix_search(prefix, limit):
+            results.extend(self._to_results(value))
+        return results[:limit]
+    
+    def search_addresses_by_prefix(self, prefix: str, limit: int = 20) -> List[str]:
+        """Busca endereços (remetentes ou destinatários) que começam com prefix."""
+        addresses = {key for key, _ in self.sender_index.prefix_search(prefix, limit)}
+        addresses.update(key for key, _ in self.receiver_index.prefix_search(prefix, limit))
+        return sorted(addresses)[:limit]
     
     def get_transactions_by_sender(self, sender: str) -> List[Dict[str, Any]]:
         """Busca todas as transações de um remetente específico."""
-        result = self.sender_index.search(sender)
-        if result is None:
-            return []
-        
-        # Se há múltiplas transações do mesmo remetente
-        if isinstance(result, list):
-            return result
-        else:
-            return [result]
+        return self._to_results(self.sender_index.search(sender))
     
     def get_transactions_by_receiver(self, receiver: str) -> List[Dict[str, Any]]:
         """Busca todas as transações para um destinatário específico."""
-        result = self.receiver_index.search(receiver)
-        if result is None:
-            return []
-        
-        # Se há múltiplas transações para o mesmo destinatário
-        if isinstance(result, list):
-            return result
-        else:
-            return [result]
+        return self._to_results(self.receiver_index.search(receiver))
+    
+    def iter_transactions_by_sender(self, sender: str) -> Iterator[Dict[str, Any]]:
+        """Cursor preguiçoso sobre as transações de um remetente, na ordem da cadeia."""
+        for entry in self.sender_index.iter_search(sender):
+            yield self._to_result(entry)
+    
+    def iter_transactions_by_receiver(self, receiver: str) -> Iterator[Dict[str, Any]]:
+        """Cursor preguiçoso sobre as transações para um destinatário, na ordem da cadeia."""
+        for entry in self.receiver_index.iter_search(receiver):
+            yield self._to_result(entry)
+    
+    def get_transactions_by_sender_page(self, sender: str, offset: int = 0, limit: int = 20) -> Dict[str, Any]:
+        """Retorna uma página das transações de um remetente."""
+        return read_page(self.iter_transactions_by_sender(sender), offset, limit)
+    
+    def get_transactions_by_receiver_page(self, receiver: str, offset: int = 0, limit: int = 20) -> Dict[str, Any]:
+        """Retorna uma página das transações para um destinatário."""
+        return read_page(self.iter_transactions_by_receiver(receiver), offset, limit)
     
     def get_transactions_by_time_range(self, start_time: float, end_time: float) -> List[Dict[str, Any]]:
         """Busca transações em um intervalo de tempo usando o índice B-tree."""
-        results = self.timestamp_index.range_search(start_time, end_time)
-        return [result[1] for result in results]  # result[1] contém o valor
+        return list(self.iter_transactions_by_time_range(start_time, end_time))
+    
+    def iter_transactions_by_time_range(self, start_time: float, end_time: float) -> Iterator[Dict[str, Any]]:
+        """Cursor preguiçoso sobre as transações de um intervalo de tempo."""
+        for _, value in self.timestamp_index.iter_range(start_time, end_time):
+            # Timestamps repetidos são agrupados em lista pelo nó da B-tree
+            if isinstance(value, list):
+                for entry in value:
+                    yield self._to_result(entry)
+            else:
+                yield self._to_result(value)
+    
+    def get_transactions_by_time_range_page(self, start_time: float, end_time: float,
+                                            offset: int = 0, limit: int = 20) -> Dict[str, Any]:
+        """Retorna uma página de transações de um intervalo de tempo.
+        
+        Lê apenas offset + limit + 1 entradas do índice, de modo que o custo
+        não depende do tamanho total do intervalo.
+        """
+        return read_page(self.iter_transactions_by_time_range(start_time, end_time), offset, limit)
+    
+    def get_chain_height(self) -> int:
+        """Retorna o número de blocos da cadeia (usado como chave de cache)."""
+        return len(self.blockchain.chain)
+    
+    def iter_blocks(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Cursor preguiçoso que serializa apenas os blocos no intervalo [start, stop)."""
+        chain = self.blockchain.chain
+        stop = len(chain) if stop is None else min(stop, len(chain))
+        for index in range(max(start, 0), stop):
+            yield chain[index].to_dict()
+    
+    def get_blocks_page(self, page: int = 0, page_size: int = 10, newest_first: bool = True) -> List[Dict[str, Any]]:
+        """Retorna uma página de blocos sem serializar a cadeia inteira."""
+        height = self.get_chain_height()
+        if newest_first:
+            stop = height - page * page_size
+            start = max(stop - page_size, 0)
+            return list(self.iter_blocks(start, stop))[::-1]
+        start = page * page_size
+        return list(self.iter_blocks(start, start + page_size))
+    
+    def get_block_transaction_counts(self, start: int = 0, stop: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Retorna o número de transações por bloco em [start, stop) a partir dos agregados pré-computados.
+        
+        Alturas negativas contam a partir do topo (start=-100 retorna os 100 blocos mais recentes).
+        """
+        return [
+            {'index': stats['start'], 'transactions_count': stats['transactions_count'], 'timestamp': stats['timestamp']}
+            for stats in self.aggregates.get_block_stats(start, stop)
+        ]
+    
+    def get_activity(self, granularity: str, start_time: float, end_time: float) -> List[Dict[str, Any]]:
+        """Retorna contagem, volume e endereços únicos por janela (minute, hour ou day)."""
+        return self.aggregates.get_buckets(granularity, start_time, end_time)
+    
+    def get_activity_summary(self, granularity: str, start_time: float, end_time: float) -> Dict[str, Any]:
+        """Totaliza a atividade de um intervalo em O(buckets)."""
+        return self.aggregates.summarize(granularity, start_time, end_time)
+    
+    def get_pending_transactions(self) -> List[Dict[str, Any]]:
+        """Retorna as transações pendentes."""
+        return [tx.to_dict() for tx in self.blockchain.mempool]
+    
+    def get_pending_transactions_page(self, offset: int = 0, limit: int = 20) -> Dict[str, Any]:
+        """Retorna uma página das transações pendentes, sem converter o mempool inteiro."""
+        return read_page((tx.to_dict() for tx in self.blockchain.mempool), offset, limit)
     
     def get_blockchain_stats(self) -> Dict[str, Any]:
         """Retorna estatísticas do blockchain."""
-        all_transactions = self.blockchain.get_all_transactions()
-        
         return {
             'total_blocks': len(self.blockchain.chain),
-            'total_transactions': len(all_transactions),
-            'pending_transactions': len(self.blockchain.pending_transactions),
-            'is_valid': self.blockchain.is_chain_valid(),
+            'total_transactions': self.aggregates.total_transactions,
+            'total_volume': self.aggregates.total_volume,
+            'pending_transactions': len(self.blockchain.mempool),
+            'is_valid': self.blockchain.is_valid(),
             'difficulty': self.blockchain.difficulty,
             'mining_reward': self.blockchain.mining_reward
         }
@@ -135,6 +428,57 @@ class BlockchainIndexer:
         """Retorna o saldo de um endereço."""
         return self.blockchain.get_balance(address)
     
+    def get_balance_at(self, address: str, height: Optional[int] = None,
+                       timestamp: Optional[float] = None) -> float:
+        """Retorna o saldo de um endereço em uma altura de bloco ou instante passado."""
+        if height is not None:
+            return self.balance_history.balance_at_height(address, height)
+        if timestamp is not None:
+            return self.balance_history.balance_at_time(address, timestamp)
+        return self.get_balance(address)
+    
+    def get_balance_series(self, address: str) -> List[Dict[str, Any]]:
+        """Retorna a evolução do saldo de um endereço, bloco a bloco."""
+        return self.balance_history.series(address)
+    
+    def get_top_counterparties(self, address: str, n: int = 10, direction: str = 'both',
+                               sort_by: str = 'volume') -> List[Dict[str, Any]]:
+        """Retorna as principais contrapartes de um endereço (direction: out, in ou both)."""
+        return self.counterparties.top_counterparties(address, n, direction, sort_by)
+    
+    def get_flow_between(self, address_a: str, address_b: str) -> Dict[str, Any]:
+        """Retorna as transferências entre dois endereços nos dois sentidos."""
+        return self.counterparties.flow_between(address_a, address_b)
+    
+    def get_connected_addresses(self, address: str, max_hops: int = 2, direction: str = 'out',
+                                max_nodes: int = 1000) -> List[Dict[str, Any]]:
+        """Retorna os endereços alcançáveis em até max_hops transferências."""
+        return self.counterparties.k_hop(address, max_hops, direction, max_nodes)
+    
+    def find_transfer_path(self, source: str, target: str, max_hops: int = 4) -> Optional[List[str]]:
+        """Retorna o caminho mais curto de transferências de source até target."""
+        return self.counterparties.find_path(source, target, max_hops)
+    
+    def get_all_balances(self) -> Dict[str, float]:
+        """Retorna o saldo de todos os endereços (cálculo vetorizado)."""
+        return self.analytics.get_balances()
+    
+    def get_top_balances(self, n: int = 10) -> List[Dict[str, Any]]:
+        """Retorna os n endereços com maior saldo."""
+        return self.analytics.top_balances(n)
+    
+    def get_net_flow(self, start_time: float, end_time: float) -> Dict[str, float]:
+        """Retorna o fluxo líquido por endereço em um intervalo de tempo."""
+        return self.analytics.net_flow(start_time, end_time)
+    
+    def get_window_volume(self, start_time: float, end_time: float) -> Dict[str, Any]:
+        """Retorna volume e número de transações em um intervalo de tempo."""
+        return self.analytics.window_volume(start_time, end_time)
+    
+    def get_transactions_dataframe(self):
+        """Retorna as transações confirmadas como DataFrame do pandas."""
+        return self.analytics.to_dataframe()
+    
     def get_full_blockchain(self) -> Dict[str, Any]:
         """Retorna o blockchain completo."""
         return self.blockchain.to_dict()
@@ -1,5 +1,12 @@
-from typing import List, Tuple, Any, Optional
+from typing import List, Tuple, Any, Optional, Iterator
+from itertools import islice, groupby
+from operator import itemgetter
 import bisect
+import heapq
+
+
+# Maior caractere Unicode: limite superior das buscas por prefixo
+MAX_CHAR = chr(0x10FFFF)
 
 
 class BTreeNode:
@@ -19,16 +26,19 @@ class BTreeNode:
         """Insere uma chave-valor no nó mantendo a ordem."""
         index = bisect.bisect_left(self.keys, key)
         if index < len(self.keys) and self.keys[index] == key:
-            # Chave já existe, atualiza o valor (ou adiciona à lista se for múltiplo)
-            if isinstance(self.values[index], list):
-                self.values[index].append(value)
-            else:
-                self.values[index] = [self.values[index], value]
+            self.add_value(index, value)
         else:
             # Nova chave
             self.keys.insert(index, key)
             self.values.insert(index, value)
     
+    def add_value(self, index: int, value: Any):
+        """Acrescenta um valor a uma chave existente (vira lista se for múltiplo)."""
+        if isinstance(self.values[index], list):
+            self.values[index].append(value)
+        else:
+            self.values[index] = [self.values[index], value]
+    
     def split(self, max_keys: int) -> Tuple['BTreeNode', Any, Any]:
         """Divide o nó em dois e retorna o nó direito e a chave/valor do meio."""
         mid_index = max_keys // 2
@@ -88,12 +98,21 @@ class BTree:
             while (child_index < len(node.keys) and key > node.keys[child_index]):
                 child_index += 1
             
+            # Chave igual a um separador: o valor fica no próprio separador,
+            # senão a folha receberia uma segunda cópia que a busca não vê
+            if child_index < len(node.keys) and key == node.keys[child_index]:
+                node.add_value(child_index, value)
+                return
+            
             child = node.children[child_index]
             
             # Se o filho está cheio, dividir primeiro
             if child.is_full(self.max_keys):
                 self._split_child(node, child_index)
                 # Após a divisão, determinar qual dos dois filhos usar
+                if key == node.keys[child_index]:
+                    node.add_value(child_index, value)
+                    return
                 if key > node.keys[child_index]:
                     child_index += 1
                 child = node.children[child_index]
@@ -110,6 +129,124 @@ class BTree:
         parent.values.insert(child_index, mid_value)
         parent.children.insert(child_index + 1, new_child)
     
+    def insert_batch(self, items: List[Tuple[Any, List[Any]]]):
+        """Insere um lote de chaves ordenadas, cada uma com sua lista de valores.
+        
+        Ao contrário de inserções individuais, cada nó é visitado no máximo
+        uma vez por lote: o lote é repartido entre os filhos pelas chaves
+        separadoras, as folhas recebem seus trechos por intercalação e os nós
+        que excedem max_keys são divididos de baixo para cima.
+        """
+        if not items:
+            return
+        promotions = self._insert_batch_node(self.root, items)
+        
+        # A raiz estourou: criar novos níveis até que caiba em um nó
+        while promotions:
+            new_root = BTreeNode(leaf=False)
+            new_root.children.append(self.root)
+            for key, value, right in promotions:
+                new_root.keys.append(key)
+                new_root.values.append(value)
+                new_root.children.append(right)
+            self.root = new_root
+            promotions = self._split_oversized(new_root)
+    
+    @staticmethod
+    def _merge_values(current: Any, values: List[Any]) -> Any:
+        """Acrescenta valores a uma chave existente (valores múltiplos viram lista)."""
+        if isinstance(current, list):
+            current.extend(values)
+            return current
+        return [current] + values
+    
+    @staticmethod
+    def _new_value(values: List[Any]) -> Any:
+        """Valor armazenado para uma chave nova: único ou lista."""
+        return values[0] if len(values) == 1 else list(values)
+    
+    def _insert_batch_node(self, node: BTreeNode, items: List[Tuple[Any, List[Any]]]) -> List[Tuple[Any, Any, BTreeNode]]:
+        """Insere um trecho ordenado do lote na subárvore; retorna as promoções para o pai."""
+        new_keys, new_values, new_children = [], [], []
+        i = 0
+        
+        if node.leaf:
+            # Intercalar as chaves da folha com as do lote
+            for key, value in zip(node.keys, node.values):
+                while i < len(items) and items[i][0] < key:
+                    new_keys.append(items[i][0])
+                    new_values.append(self._new_value(items[i][1]))
+                    i += 1
+                if i < len(items) and items[i][0] == key:
+                    value = self._merge_values(value, items[i][1])
+                    i += 1
+                new_keys.append(key)
+                new_values.append(value)
+            for key, values in items[i:]:
+                new_keys.append(key)
+                new_values.append(self._new_value(values))
+        else:
+            batch_keys = [key for key, _ in items]
+            for child_index, child in enumerate(node.children):
+                # Trecho do lote que pertence a este filho
+                if child_index < len(node.keys):
+                    end = bisect.bisect_left(batch_keys, node.keys[child_index], i)
+                else:
+                    end = len(items)
+                
+                new_children.append(child)
+                if end > i:
+                    for key, value, right in self._insert_batch_node(child, items[i:end]):
+                        new_keys.append(key)
+                        new_values.append(value)
+                        new_children.append(right)
+                i = end
+                
+                # Chave separadora (pode receber valores do lote)
+                if child_index < len(node.keys):
+                    value = node.values[child_index]
+                    if i < len(items) and items[i][0] == node.keys[child_index]:
+                        value = self._merge_values(value, items[i][1])
+                        i += 1
+                    new_keys.append(node.keys[child_index])
+                    new_values.append(value)
+            node.children = new_children
+        
+        node.keys, node.values = new_keys, new_values
+        return self._split_oversized(node)
+    
+    def _split_oversized(self, node: BTreeNode) -> List[Tuple[Any, Any, BTreeNode]]:
+        """Divide um nó com mais de max_keys chaves em vários nós equilibrados.
+        
+        O nó passa a conter o primeiro pedaço; retorna (chave, valor, nó à
+        direita) para cada separador que deve subir ao pai.
+        """
+        n = len(node.keys)
+        if n <= self.max_keys:
+            return []
+        
+        # Menor número de pedaços em que cada um cabe em max_keys
+        chunks = -(-(n + 1) // (self.max_keys + 1))
+        base, extra = divmod(n - (chunks - 1), chunks)
+        
+        keys, values, children = node.keys, node.values, node.children
+        pieces = []
+        start = 0
+        for chunk in range(chunks):
+            size = base + (1 if chunk < extra else 0)
+            piece = node if chunk == 0 else BTreeNode(leaf=node.leaf)
+            piece.keys = keys[start:start + size]
+            piece.values = values[start:start + size]
+            if not node.leaf:
+                piece.children = children[start:start + size + 1]
+            pieces.append((start, piece))
+            start += size + 1  # Pular o separador
+        
+        return [
+            (keys[piece_start - 1], values[piece_start - 1], piece)
+            for piece_start, piece in pieces[1:]
+        ]
+    
     def search(self, key: Any) -> Optional[Any]:
         """Busca uma chave na B-tree."""
         return self._search_node(self.root, key)
@@ -133,33 +270,44 @@ class BTree:
     
     def range_search(self, min_key: Any, max_key: Any) -> List[Tuple[Any, Any]]:
         """Busca todas as chaves-valores em um intervalo."""
-        results = []
-        self._range_search_node(self.root, min_key, max_key, results)
-        return results
+        return list(self.iter_range(min_key, max_key))
     
-    def _range_search_node(self, node: BTreeNode, min_key: Any, max_key: Any, results: List[Tuple[Any, Any]]):
-        """Busca em intervalo em um nó específico."""
-        i = 0
+    def iter_range(self, min_key: Any, max_key: Any) -> Iterator[Tuple[Any, Any]]:
+        """Cursor preguiçoso sobre as chaves-valores de um intervalo, em ordem.
+
+        Ao contrário de range_search, não materializa a lista de resultados:
+        os nós são visitados sob demanda, permitindo paginação com islice.
+        """
+        return self._iter_range_node(self.root, min_key, max_key)
+    
+    def _iter_range_node(self, node: BTreeNode, min_key: Any, max_key: Any) -> Iterator[Tuple[Any, Any]]:
+        """Percorre em ordem apenas as subárvores que podem conter o intervalo."""
+        # Pular chaves menores que min_key (e seus filhos à esquerda)
+        i = bisect.bisect_left(node.keys, min_key)
         
-        # Percorrer as chaves do nó
         while i < len(node.keys):
-            # Se não é folha, buscar no filho à esquerda
             if not node.leaf:
-                self._range_search_node(node.children[i], min_key, max_key, results)
-            
-            # Se a chave está no intervalo, adicionar aos resultados
-            if min_key <= node.keys[i] <= max_key:
-                results.append((node.keys[i], node.values[i]))
+                yield from self._iter_range_node(node.children[i], min_key, max_key)
             
-            # Se a chave é maior que max_key, parar
             if node.keys[i] > max_key:
                 return
             
+            yield node.keys[i], node.values[i]
             i += 1
         
-        # Se não é folha, buscar no último filho
+        # Último filho à direita
         if not node.leaf:
-            self._range_search_node(node.children[i], min_key, max_key, results)
+            yield from self._iter_range_node(node.children[i], min_key, max_key)
+    
+    def prefix_search(self, prefix: str, limit: Optional[int] = None) -> List[Tuple[Any, Any]]:
+        """Busca as chaves string que começam com prefix.
+        
+        É uma busca por intervalo limitada: todas as chaves com o prefixo
+        estão entre prefix e prefix + maior caractere, então só o caminho até
+        o prefixo e os limit primeiros resultados são visitados.
+        """
+        matches = self.iter_range(prefix, prefix + MAX_CHAR)
+        return list(islice(matches, limit))
     
     def get_all_items(self) -> List[Tuple[Any, Any]]:
         """Retorna todas as chaves-valores da B-tree em ordem."""
@@ -167,6 +315,14 @@ class BTree:
         self._inorder_traversal(self.root, results)
         return results
     
+    def __len__(self) -> int:
+        """Número de chaves distintas na árvore."""
+        return self._count_keys(self.root)
+    
+    def _count_keys(self, node: BTreeNode) -> int:
+        """Conta as chaves de um nó e de sua subárvore."""
+        return len(node.keys) + sum(self._count_keys(child) for child in node.children)
+    
     def _inorder_traversal(self, node: BTreeNode, results: List[Tuple[Any, Any]]):
         """Percorre a árvore em ordem."""
         i = 0
@@ -196,3 +352,84 @@ class BTree:
             for child in node.children:
                 self._print_node(child, lAntôniol + 1)
 
+
+class BufferedBTree(BTree):
+    """B-tree otimizada para escrita, com uma memtable de inserções pendentes.
+    
+    As inserções vão para um dicionário em memória e são aplicadas à árvore
+    em lotes ordenados (insert_batch) quando a memtable atinge buffer_size
+    chaves. Chaves repetidas no lote (como endereços) descem uma única vez.
+    Buscas exatas e por intervalo combinam árvore e memtable sem alterar
+    nenhuma das duas, então toda escrita é visível para a leitura seguinte
+    e leituras concorrentes não modificam o índice.
+    """
+    
+    def __init__(self, max_keys: int = 5, buffer_size: int = 1024):
+        super().__init__(max_keys)
+        self.buffer_size = buffer_size
+        self.buffer: dict = {}  # chave -> lista de valores ainda não aplicados
+    
+    def insert(self, key: Any, value: Any):
+        """Registra a inserção na memtable, aplicando o lote quando ela enche."""
+        values = self.buffer.get(key)
+        if values is None:
+            self.buffer[key] = [value]
+            if len(self.buffer) >= self.buffer_size:
+                self.flush()
+        else:
+            values.append(value)
+    
+    def flush(self):
+        """Aplica a memtable à árvore em um único lote ordenado."""
+        if self.buffer:
+            items = sorted(self.buffer.items(), key=lambda item: item[0])
+            self.buffer = {}
+            self.insert_batch(items)
+    
+    def search(self, key: Any) -> Optional[Any]:
+        """Busca uma chave na árvore e na memtable."""
+        stored = super().search(key)
+        pending = self.buffer.get(key)
+        if pending is None:
+            return stored
+        if stored is None:
+            return self._new_value(pending)
+        # Nova lista: o valor armazenado na árvore não é alterado pela leitura
+        return (stored if isinstance(stored, list) else [stored]) + pending
+    
+    def _merge_pending(self, stored: Iterator[Tuple[Any, Any]],
+                       pending: List[Tuple[Any, List[Any]]]) -> Iterator[Tuple[Any, Any]]:
+        """Intercala itens da árvore com itens ordenados da memtable, sem alterar nenhum dos dois."""
+        # Em chaves iguais heapq.merge mantém a árvore antes da memtable (ordem de chegada)
+        merged = heapq.merge(stored, ((key, self._new_value(values)) for key, values in pending),
+                             key=itemgetter(0))
+        for key, group in groupby(merged, key=itemgetter(0)):
+            values = [value for _, value in group]
+            if len(values) == 1:
+                yield key, values[0]
+            else:
+                # Nova lista: o valor armazenado na árvore não é alterado pela leitura
+                yield key, [entry for value in values for entry in (value if isinstance(value, list) else [value])]
+    
+    def iter_range(self, min_key: Any, max_key: Any) -> Iterator[Tuple[Any, Any]]:
+        """Cursor sobre um intervalo, combinando árvore e memtable.
+        
+        A leitura não aplica a memtable: consultas concorrentes nunca
+        modificam a árvore.
+        """
+        pending = sorted(
+            ((key, values) for key, values in self.buffer.items() if min_key <= key <= max_key),
+            key=itemgetter(0)
+        )
+        stored = super().iter_range(min_key, max_key)
+        return self._merge_pending(stored, pending) if pending else stored
+    
+    def get_all_items(self) -> List[Tuple[Any, Any]]:
+        """Retorna todas as chaves-valores em ordem, combinando árvore e memtable."""
+        pending = sorted(self.buffer.items(), key=itemgetter(0))
+        return list(self._merge_pending(iter(super().get_all_items()), pending))
+    
+    def __len__(self) -> int:
+        """Número de chaves distintas, contando as da memtable que ainda não estão na árvore."""
+        stored = super().__len__()
+        return stored + sum(1 for key in self.buffer if BTree.search(self, key) is None)
@@ -0,0 +1,111 @@
+"""Exportação e importação em streaming da cadeia em NDJSON.
+
+Cada linha é um objeto JSON independente: um cabeçalho com os parâmetros
+da cadeia e a altura do primeiro bloco gravado (start), e para cada bloco
+uma linha de bloco seguida de uma linha por transação. Tanto a escrita quanto a leitura processam uma linha por vez,
+de modo que a memória usada não depende do tamanho da cadeia. Arquivos
+terminados em .gz (ou com compress='gzip') são comprimidos com gzip.
+"""
+import gzip
+import json
+from typing import Dict, Any, Iterator, Iterable, Optional, Tuple, IO
+
+from blockchain import Blockchain, Block, Transaction
+
+
+FORMAT_VERSION = 1
+
+
+def _open(path: str, mode: str, compress: Optional[str]) -> IO[str]:
+    """Abre o arquivo em modo texto, com gzip se pedido ou se a extensão for .gz."""
+    if compress == 'gzip' or (compress is None and path.endswith('.gz')):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def iter_records(blockchain: Blockchain, start: int = 0) -> Iterator[Dict[str, Any]]:
+    """Gera os registros da cadeia (cabeçalho, blocos e transações), um por vez."""
+    yield {
+        'type': 'header',
+        'version': FORMAT_VERSION,
+        'difficulty': blockchain.difficulty,
+        'mining_reward': blockchain.mining_reward,
+        'height': len(blockchain.chain),
+        'start': start
+    }
+    for block in blockchain.chain[start:]:
+        yield {
+            'type': 'block',
+            'index': block.index,
+            'timestamp': block.timestamp,
+            'previous_hash': block.previous_hash,
+            'nonce': block.nonce,
+            'hash': block.hash,
+            'transactions_count': len(block.transactions)
+        }
+        for transaction in block.transactions:
+            record = transaction.to_dict()
+            record['type'] = 'transaction'
+            yield record
+
+
+def iter_lines(blockchain: Blockchain, start: int = 0) -> Iterator[str]:
+    """Gera as linhas NDJSON da cadeia (útil para enviar por rede sem arquivo)."""
+    for record in iter_records(blockchain, start):
+        yield json.dumps(record, separators=(',', ':')) + '\n'
+
+
+def export_ndjson(blockchain: Blockchain, path: str, compress: Optional[str] = None, start: int = 0) -> int:
+    """Grava a cadeia em NDJSON a partir do bloco start. Retorna o número de blocos gravados."""
+    with _open(path, 'w', compress) as f:
+        f.writelines(iter_lines(blockchain, start))
+    return max(len(blockchain.chain) - start, 0)
+
+
+def iter_blocks(lines: Iterable[str]) -> Tuple[Dict[str, Any], Iterator[Block]]:
+    """Lê o cabeçalho e retorna um gerador que reconstrói os blocos linha a linha."""
+    lines = iter(lines)
+    header = json.loads(next(lines))
+    if header.get('type') != 'header' or header.get('version') != FORMAT_VERSION:
+        raise ValueError("Arquivo NDJSON de blockchain inválido.")
+
+    def blocks() -> Iterator[Block]:
+        for line in lines:
+            record = json.loads(line)
+            if record.get('type') != 'block':
+                raise ValueError(f"Registro inesperado: {record.get('type')}")
+            transactions = [
+                Transaction.from_dict(json.loads(next(lines)))
+                for _ in range(record['transactions_count'])
+            ]
+            yield Block.from_dict(record, transactions)
+
+    return header, blocks()
+
+
+def import_ndjson(path: str, indexer=None, compress: Optional[str] = None, **indexer_options):
+    """Importa uma cadeia em NDJSON direto para um BlockchainIndexer.
+
+    Sem indexer, cria um novo a partir do bloco gênese do arquivo, que então
+    precisa ter sido exportado desde o início. Com um indexer existente, os
+    blocos já presentes são ignorados e os demais são validados e indexados
+    em lotes (sincronização incremental entre nós); o arquivo não pode
+    começar depois da altura atual do indexer.
+    """
+    from blockchain_indexer import BlockchainIndexer
+
+    with _open(path, 'r', compress) as f:
+        header, blocks = iter_blocks(f)
+        start = header.get('start', 0)
+        height = 0 if indexer is None else len(indexer.blockchain.chain)
+        if start > height:
+            raise ValueError(f"O arquivo começa no bloco {start}, mas a cadeia tem apenas {height} bloco(s).")
+
+        if indexer is None:
+            blockchain = Blockchain(chain=[next(blocks)])
+            blockchain.difficulty = header['difficulty']
+            blockchain.mining_reward = header['mining_reward']
+            indexer = BlockchainIndexer(blockchain, **indexer_options)
+
+        indexer.import_blocks(blocks)
+    return indexer
@@ -0,0 +1,164 @@
+from typing import List, Dict, Any, Optional, Tuple
+from collections import deque
+import heapq
+
+
+class EdgeStats:
+    """Resumo das transferências de um endereço para outro."""
+
+    __slots__ = ('count', 'volume', 'last_seen')
+
+    def __init__(self):
+        self.count = 0
+        self.volume = 0.0
+        self.last_seen = 0.0
+
+    def add(self, transaction):
+        """Acumula uma transferência na aresta."""
+        self.count += 1
+        self.volume += transaction.amount
+        self.last_seen = max(self.last_seen, transaction.timestamp)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converte a aresta para um dicionário."""
+        return {
+            'transactions_count': self.count,
+            'volume': self.volume,
+            'last_seen': self.last_seen
+        }
+
+
+class CounterpartyGraph:
+    """Grafo de contrapartes entre endereços, mantido a cada bloco indexado.
+
+    Cada par (remetente, destinatário) tem uma única aresta com contagem,
+    volume e último timestamp. A mesma aresta fica acessível pelos dois
+    lados (outgoing[remetente][destinatário] e incoming[destinatário][remetente]),
+    então as consultas custam proporcionalmente ao número de contrapartes,
+    e não ao histórico de transações do endereço. Recompensas de mineração
+    (sem remetente) não formam arestas.
+    """
+
+    DIRECTIONS = ('out', 'in', 'both')
+    SORT_FIELDS = ('volume', 'transactions_count', 'last_seen')
+
+    def __init__(self):
+        self.outgoing: Dict[str, Dict[str, EdgeStats]] = {}
+        self.incoming: Dict[str, Dict[str, EdgeStats]] = {}
+
+    def add_block(self, block):
+        """Acumula as transferências de um bloco recém-indexado."""
+        for transaction in block.transactions:
+            sender, receiver = transaction.sender, transaction.receiver
+            if not sender or not receiver:
+                continue
+            edges = self.outgoing.setdefault(sender, {})
+            edge = edges.get(receiver)
+            if edge is None:
+                edge = edges[receiver] = EdgeStats()
+                self.incoming.setdefault(receiver, {})[sender] = edge
+            edge.add(transaction)
+
+    def _sides(self, address: str, direction: str) -> List[Tuple[str, Dict[str, EdgeStats]]]:
+        """Arestas do endereço na direção pedida, rotuladas como enviadas ou recebidas."""
+        if direction not in self.DIRECTIONS:
+            raise ValueError(f"Direção inválida: {direction}")
+        sides = []
+        if direction in ('out', 'both'):
+            sides.append(('sent', self.outgoing.get(address, {})))
+        if direction in ('in', 'both'):
+            sides.append(('received', self.incoming.get(address, {})))
+        return sides
+
+    def counterparties(self, address: str, direction: str = 'both') -> Dict[str, Dict[str, Any]]:
+        """Resumo por contraparte (enviado, recebido e totais combinados)."""
+        summary: Dict[str, Dict[str, Any]] = {}
+        for field, edges in self._sides(address, direction):
+            for counterparty, edge in edges.items():
+                item = summary.get(counterparty)
+                if item is None:
+                    item = summary[counterparty] = {
+                        'address': counterparty,
+                        'sent': 0.0,
+                        'received': 0.0,
+                        'transactions_count': 0,
+                        'volume': 0.0,
+                        'last_seen': 0.0
+                    }
+                item[field] += edge.volume
+                item['transactions_count'] += edge.count
+                item['volume'] += edge.volume
+                item['last_seen'] = max(item['last_seen'], edge.last_seen)
+        return summary
+
+    def top_counterparties(self, address: str, n: int = 10, direction: str = 'both',
+                           sort_by: str = 'volume') -> List[Dict[str, Any]]:
+        """Retorna as n principais contrapartes do endereço pelo campo sort_by."""
+        if sort_by not in self.SORT_FIELDS:
+            raise ValueError(f"Campo de ordenação inválido: {sort_by}")
+        summary = self.counterparties(address, direction)
+        return heapq.nlargest(n, summary.values(), key=lambda item: item[sort_by])
+
+    def flow_between(self, address_a: str, address_b: str) -> Dict[str, Any]:
+        """Transferências nos dois sentidos entre dois endereços e o saldo líquido."""
+        a_to_b = self.outgoing.get(address_a, {}).get(address_b)
+        b_to_a = self.outgoing.get(address_b, {}).get(address_a)
+        a_to_b = a_to_b.to_dict() if a_to_b else EdgeStats().to_dict()
+        b_to_a = b_to_a.to_dict() if b_to_a else EdgeStats().to_dict()
+        return {
+            'a_to_b': a_to_b,
+            'b_to_a': b_to_a,
+            'net': a_to_b['volume'] - b_to_a['volume']  # Positivo: A enviou mais a B
+        }
+
+    def k_hop(self, address: str, max_hops: int = 2, direction: str = 'out',
+              max_nodes: int = 1000) -> List[Dict[str, Any]]:
+        """Endereços alcançáveis em até max_hops saltos (busca em largura).
+
+        Cada resultado traz a distância e o endereço anterior no caminho
+        mais curto. A busca para ao visitar max_nodes endereços, limitando
+        o custo em grafos densos.
+        """
+        seen = {address}
+        results = []
+        queue = deque([(address, 0)])
+        while queue and len(results) < max_nodes:
+            current, hops = queue.popleft()
+            if hops == max_hops:
+                continue
+            for _, edges in self._sides(current, direction):
+                for neighbor in edges:
+                    if neighbor in seen:
+                        continue
+                    seen.add(neighbor)
+                    results.append({'address': neighbor, 'hops': hops + 1, 'via': current})
+                    queue.append((neighbor, hops + 1))
+                    if len(results) >= max_nodes:
+                        return results
+        return results
+
+    def find_path(self, source: str, target: str, max_hops: int = 4,
+                  direction: str = 'out') -> Optional[List[str]]:
+        """Caminho mais curto de source a target com até max_hops saltos (None se não houver)."""
+        if source == target:
+            return [source]
+        parents: Dict[str, Optional[str]] = {source: None}
+        frontier = [source]
+        for _ in range(max_hops):
+            next_frontier = []
+            for current in frontier:
+                for _, edges in self._sides(current, direction):
+                    for neighbor in edges:
+                        if neighbor in parents:
+                            continue
+                        parents[neighbor] = current
+                        if neighbor == target:
+                            path = [neighbor]
+                            while parents[path[-1]] is not None:
+                                path.append(parents[path[-1]])
+                            return path[::-1]
+                        next_frontier.append(neighbor)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        return None
@@ -0,0 +1,251 @@
+from abc import ABC, abstractmethod
+from typing import List, Tuple, Any, Optional, Iterator, Dict
+from itertools import islice
+import bisect
+
+from btree import MAX_CHAR, BTree, BufferedBTree
+
+
+def _merge_value(current: Any, value: Any) -> Any:
+    """Agrupa valores de chaves repetidas em lista, como faz o nó da B-tree."""
+    if isinstance(current, list):
+        current.append(value)
+        return current
+    return [current, value]
+
+
+def insert_many(index, items: List[Tuple[Any, Any]]):
+    """Insere vários pares (chave, valor), na ordem dada, usando o caminho em lote do motor.
+    
+    Na B-tree os valores são agrupados por chave e aplicados com um único
+    insert_batch ordenado, que visita cada nó no máximo uma vez. Na
+    BufferedBTree, lotes menores que a memtable continuam passando por ela;
+    lotes maiores esvaziam a memtable e vão direto para a árvore. Os demais
+    motores inserem em O(1) ou no fim do array, um par por vez.
+    """
+    if isinstance(index, BufferedBTree) and len(items) < index.buffer_size:
+        for key, value in items:
+            index.insert(key, value)
+    elif isinstance(index, BTree):
+        grouped: Dict[Any, List[Any]] = {}
+        for key, value in items:
+            grouped.setdefault(key, []).append(value)
+        if isinstance(index, BufferedBTree):
+            index.flush()  # Valores pendentes entram antes dos do lote
+        index.insert_batch(sorted(grouped.items(), key=lambda item: item[0]))
+    else:
+        for key, value in items:
+            index.insert(key, value)
+
+
+class IndexEngine(ABC):
+    """Interface comum dos motores de índice usados pelo BlockchainIndexer.
+
+    Todos os motores aceitam as mesmas operações; o que muda é o custo de
+    cada uma. A BTree (btree.py) não herda desta classe, para não depender
+    deste módulo, e é registrada como subclasse virtual no fim dele.
+    """
+
+    ordered = True  # Se o motor mantém as chaves ordenadas (intervalos e prefixos eficientes)
+
+    @abstractmethod
+    def insert(self, key: Any, value: Any):
+        """Insere uma chave-valor (chaves repetidas acumulam os valores em lista)."""
+
+    @abstractmethod
+    def search(self, key: Any) -> Optional[Any]:
+        """Busca o valor de uma chave exata."""
+
+    @abstractmethod
+    def iter_range(self, min_key: Any, max_key: Any) -> Iterator[Tuple[Any, Any]]:
+        """Cursor sobre as chaves-valores de um intervalo, em ordem."""
+
+    def range_search(self, min_key: Any, max_key: Any) -> List[Tuple[Any, Any]]:
+        """Busca todas as chaves-valores em um intervalo."""
+        return list(self.iter_range(min_key, max_key))
+
+    def prefix_search(self, prefix: str, limit: Optional[int] = None) -> List[Tuple[Any, Any]]:
+        """Busca as chaves string que começam com prefix."""
+        return list(islice(self.iter_range(prefix, prefix + MAX_CHAR), limit))
+
+    @abstractmethod
+    def get_all_items(self) -> List[Tuple[Any, Any]]:
+        """Retorna todas as chaves-valores em ordem."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Número de chaves distintas."""
+
+
+class HashIndex(IndexEngine):
+    """Índice hash com endereçamento aberto (sondagem linear).
+
+    Buscas exatas custam O(1) em média. As chaves não ficam ordenadas:
+    intervalos e prefixos percorrem a tabela inteira e ordenam o resultado,
+    por isso este motor é indicado para atributos consultados só por igualdade.
+    """
+
+    ordered = False
+    _EMPTY = object()  # Marca de posição livre
+    _MULTIPLIER = 0x9E3779B97F4A7C15  # 2^64 / razão áurea (hash de Fibonacci)
+    _MASK64 = (1 << 64) - 1
+
+    def __init__(self, initial_capacity: int = 64, max_load: float = 0.7):
+        capacity = 8
+        while capacity < initial_capacity:
+            capacity *= 2
+        self.max_load = max_load
+        self.size = 0
+        self._shift = 64 - (capacity.bit_length() - 1)
+        self.keys: List[Any] = [self._EMPTY] * capacity
+        self.values: List[Any] = [None] * capacity
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _probe(self, key: Any) -> int:
+        """Retorna a posição da chave ou a primeira posição livre da sua sequência de sondagem."""
+        mask = len(self.keys) - 1
+        # Os bits altos do produto espalham chaves de hash regular (como
+        # timestamps próximos), que com sondagem linear formariam aglomerados
+        slot = ((hash(key) * self._MULTIPLIER) & self._MASK64) >> self._shift
+        keys = self.keys
+        while True:
+            current = keys[slot]
+            if current is self._EMPTY or current == key:
+                return slot
+            slot = (slot + 1) & mask
+
+    def _resize(self):
+        """Dobra a capacidade e reinsere as chaves."""
+        old_keys, old_values = self.keys, self.values
+        self.keys = [self._EMPTY] * (len(old_keys) * 2)
+        self.values = [None] * (len(old_keys) * 2)
+        self._shift -= 1
+        for key, value in zip(old_keys, old_values):
+            if key is not self._EMPTY:
+                slot = self._probe(key)
+                self.keys[slot] = key
+                self.values[slot] = value
+
+    def insert(self, key: Any, value: Any):
+        """Insere uma chave-valor (chaves repetidas acumulam valores em lista)."""
+        if (self.size + 1) > self.max_load * len(self.keys):
+            self._resize()
+
+        slot = self._probe(key)
+        if self.keys[slot] is self._EMPTY:
+            self.keys[slot] = key
+            self.values[slot] = value
+            self.size += 1
+        else:
+            self.values[slot] = _merge_value(self.values[slot], value)
+
+    def search(self, key: Any) -> Optional[Any]:
+        """Busca uma chave em O(1) médio."""
+        slot = self._probe(key)
+        if self.keys[slot] is self._EMPTY:
+            return None
+        return self.values[slot]
+
+    def iter_range(self, min_key: Any, max_key: Any) -> Iterator[Tuple[Any, Any]]:
+        """Varre a tabela inteira (O(n log n)): o hash não preserva ordem."""
+        items = [
+            (key, value) for key, value in zip(self.keys, self.values)
+            if key is not self._EMPTY and min_key <= key <= max_key
+        ]
+        items.sort(key=lambda item: item[0])
+        return iter(items)
+
+    def get_all_items(self) -> List[Tuple[Any, Any]]:
+        """Retorna todas as chaves-valores em ordem."""
+        items = [(key, value) for key, value in zip(self.keys, self.values) if key is not self._EMPTY]
+        items.sort(key=lambda item: item[0])
+        return items
+
+
+class SortedArrayIndex(IndexEngine):
+    """Índice em arrays ordenados, indicado para segmentos imutáveis.
+
+    Buscas exatas e por intervalo usam busca binária sobre listas contíguas,
+    sem nós nem ponteiros. Inserções fora de ordem custam O(n); acréscimos
+    em ordem crescente (o caso dos timestamps) são O(1) amortizado.
+    """
+
+    def __init__(self, items: Optional[List[Tuple[Any, Any]]] = None):
+        # Os itens iniciais devem estar ordenados e sem chaves repetidas
+        self.keys: List[Any] = [key for key, _ in items] if items else []
+        self.values: List[Any] = [value for _, value in items] if items else []
+
+    @classmethod
+    def from_index(cls, index) -> 'SortedArrayIndex':
+        """Constrói o array a partir de outro motor (por exemplo, ao congelar um segmento).
+        
+        Itens consecutivos de mesma chave são agrupados, já que o construtor
+        exige chaves únicas.
+        """
+        items = []
+        for key, value in index.get_all_items():
+            if items and items[-1][0] == key:
+                previous = items[-1][1]
+                merged = list(previous) if isinstance(previous, list) else [previous]
+                merged.extend(value if isinstance(value, list) else [value])
+                items[-1] = (key, merged)
+            else:
+                items.append((key, value))
+        return cls(items)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def insert(self, key: Any, value: Any):
+        """Insere uma chave-valor mantendo a ordem."""
+        keys = self.keys
+        if not keys or key > keys[-1]:
+            keys.append(key)
+            self.values.append(value)
+            return
+
+        index = bisect.bisect_left(keys, key)
+        if index < len(keys) and keys[index] == key:
+            self.values[index] = _merge_value(self.values[index], value)
+        else:
+            keys.insert(index, key)
+            self.values.insert(index, value)
+
+    def search(self, key: Any) -> Optional[Any]:
+        """Busca binária por uma chave."""
+        index = bisect.bisect_left(self.keys, key)
+        if index < len(self.keys) and self.keys[index] == key:
+            return self.values[index]
+        return None
+
+    def iter_range(self, min_key: Any, max_key: Any) -> Iterator[Tuple[Any, Any]]:
+        """Cursor sobre as chaves-valores de um intervalo, em ordem."""
+        first = bisect.bisect_left(self.keys, min_key)
+        last = bisect.bisect_right(self.keys, max_key)
+        for index in range(first, last):
+            yield self.keys[index], self.values[index]
+
+    def get_all_items(self) -> List[Tuple[Any, Any]]:
+        """Retorna todas as chaves-valores em ordem."""
+        return list(zip(self.keys, self.values))
+
+
+IndexEngine.register(BTree)
+
+
+# Motores disponíveis, pelo nome usado na configuração do indexador
+INDEX_ENGINES: Dict[str, type] = {
+    'btree': BTree,
+    'buffered_btree': BufferedBTree,
+    'hash': HashIndex,
+    'sorted_array': SortedArrayIndex
+}
+
+
+def create_index(engine: str, **options) -> IndexEngine:
+    """Cria um índice do motor indicado (btree, buffered_btree, hash ou sorted_array)."""
+    if engine not in INDEX_ENGINES:
+        raise ValueError(f"Motor de índice desconhecido: {engine}")
+    return INDEX_ENGINES[engine](**options)
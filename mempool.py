@@ -0,0 +1,140 @@
+from typing import List, Dict, Optional, Iterator, TYPE_CHECKING
+import heapq
+import itertools
+
+if TYPE_CHECKING:
+    from blockchain import Transaction
+
+
+class Mempool:
+    """Conjunto indexado e limitado de transações pendentes.
+
+    Mantém um índice hash por ID, índices por remetente e destinatário e um
+    heap de prioridade por taxa (fee) para despejo quando o limite é atingido.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self.transactions: Dict[str, 'Transaction'] = {}  # Índice hash por ID (em ordem de chegada)
+        self.by_sender: Dict[str, Dict[str, 'Transaction']] = {}
+        self.by_receiver: Dict[str, Dict[str, 'Transaction']] = {}
+        self.pending_spend: Dict[str, float] = {}  # Valor + taxa já comprometidos por remetente
+        self._sequence: Dict[str, int] = {}
+        self._counter = itertools.count()
+        self._eviction_heap: List = []  # (fee, sequência, id); entradas removidas são ignoradas
+
+    def __len__(self) -> int:
+        return len(self.transactions)
+
+    def __contains__(self, transaction_id: str) -> bool:
+        return transaction_id in self.transactions
+
+    def __iter__(self) -> Iterator['Transaction']:
+        return iter(self.transactions.values())
+
+    def get(self, transaction_id: str) -> Optional['Transaction']:
+        """Busca uma transação pendente por ID em O(1)."""
+        return self.transactions.get(transaction_id)
+
+    def get_by_sender(self, sender: str) -> List['Transaction']:
+        """Retorna as transações pendentes enviadas por um endereço."""
+        return list(self.by_sender.get(sender, {}).values())
+
+    def get_by_receiver(self, receiver: str) -> List['Transaction']:
+        """Retorna as transações pendentes recebidas por um endereço."""
+        return list(self.by_receiver.get(receiver, {}).values())
+
+    def get_pending_spend(self, sender: str) -> float:
+        """Retorna quanto um remetente já comprometeu em transações pendentes."""
+        return self.pending_spend.get(sender, 0.0)
+
+    def add(self, transaction: 'Transaction') -> Optional['Transaction']:
+        """Adiciona uma transação, despejando a de menor taxa se o pool estiver cheio.
+
+        Retorna a transação despejada (ou None).
+        """
+        # Valor negativo ou taxa negativa reduziriam o custo do remetente às
+        # custas do destinatário ou da recompensa do minerador
+        if not transaction.amount > 0:
+            raise Exception("O valor da transação deve ser positivo.")
+        if not transaction.fee >= 0:
+            raise Exception("A taxa da transação não pode ser negativa.")
+        if transaction.transaction_id in self.transactions:
+            raise Exception("Transação já está pendente.")
+
+        evicted = None
+        if len(self.transactions) >= self.max_size:
+            lowest = self._peek_lowest()
+            if lowest is None or lowest.fee >= transaction.fee:
+                raise Exception("Pool de transações pendentes cheio.")
+            evicted = self.remove(lowest.transaction_id)
+
+        sequence = next(self._counter)
+        self.transactions[transaction.transaction_id] = transaction
+        self._sequence[transaction.transaction_id] = sequence
+        heapq.heappush(self._eviction_heap, (transaction.fee, sequence, transaction.transaction_id))
+
+        if transaction.sender is not None:
+            self.by_sender.setdefault(transaction.sender, {})[transaction.transaction_id] = transaction
+            self.pending_spend[transaction.sender] = (
+                self.pending_spend.get(transaction.sender, 0.0) + transaction.amount + transaction.fee
+            )
+        if transaction.receiver is not None:
+            self.by_receiver.setdefault(transaction.receiver, {})[transaction.transaction_id] = transaction
+
+        return evicted
+
+    def remove(self, transaction_id: str) -> Optional['Transaction']:
+        """Remove uma transação de todos os índices."""
+        transaction = self.transactions.pop(transaction_id, None)
+        if transaction is None:
+            return None
+        del self._sequence[transaction_id]
+
+        if transaction.sender is not None:
+            sent = self.by_sender[transaction.sender]
+            del sent[transaction_id]
+            if not sent:
+                del self.by_sender[transaction.sender]
+                del self.pending_spend[transaction.sender]
+            else:
+                self.pending_spend[transaction.sender] -= transaction.amount + transaction.fee
+        if transaction.receiver is not None:
+            received = self.by_receiver[transaction.receiver]
+            del received[transaction_id]
+            if not received:
+                del self.by_receiver[transaction.receiver]
+
+        # A entrada no heap é descartada preguiçosamente em _peek_lowest
+        return transaction
+
+    def remove_many(self, transactions: List['Transaction']):
+        """Remove um conjunto de transações (por exemplo, as incluídas em um bloco)."""
+        for transaction in transactions:
+            self.remove(transaction.transaction_id)
+
+        # Reconstruir o heap quando as entradas obsoletas dominarem
+        if len(self._eviction_heap) > 2 * len(self.transactions) + 64:
+            self._eviction_heap = [
+                (tx.fee, self._sequence[tx_id], tx_id) for tx_id, tx in self.transactions.items()
+            ]
+            heapq.heapify(self._eviction_heap)
+
+    def _peek_lowest(self) -> Optional['Transaction']:
+        """Retorna a transação de menor prioridade, limpando entradas obsoletas do heap."""
+        heap = self._eviction_heap
+        while heap:
+            _, sequence, transaction_id = heap[0]
+            if self._sequence.get(transaction_id) == sequence:
+                return self.transactions[transaction_id]
+            heapq.heappop(heap)
+        return None
+
+    def select(self, limit: Optional[int] = None) -> List['Transaction']:
+        """Seleciona transações para um bloco: maior taxa primeiro, depois ordem de chegada."""
+        def priority(tx):
+            return (-tx.fee, self._sequence[tx.transaction_id])
+
+        if limit is None or limit >= len(self.transactions):
+            return sorted(self.transactions.values(), key=priority)
+        return heapq.nsmallest(limit, self.transactions.values(), key=priority)
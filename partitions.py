@@ -0,0 +1,321 @@
+from typing import List, Dict, Any, Optional, Iterator, Iterable, Tuple, Callable, Set
+from itertools import groupby
+from operator import itemgetter
+import heapq
+import os
+
+from index_engines import IndexEngine, SortedArrayIndex, insert_many
+from segments import Segment, SegmentIndex, encode_segment, write_atomic
+
+
+# Atributos indexados por partição (o ID de transação tem índice global)
+PARTITIONED_ATTRIBUTES = ('timestamp', 'sender', 'receiver')
+
+
+def _merge_equal_keys(items: Iterator[Tuple[Any, Any]]) -> Iterator[Tuple[Any, Any]]:
+    """Junta em um só item as chaves repetidas entre partições (itens já em ordem de chave)."""
+    for key, group in groupby(items, key=itemgetter(0)):
+        values = [value for _, value in group]
+        if len(values) == 1:
+            yield key, values[0]
+            continue
+        # Nova lista: os valores guardados nas partições não são alterados
+        merged = []
+        for value in values:
+            if isinstance(value, list):
+                merged.extend(value)
+            else:
+                merged.append(value)
+        yield key, merged
+
+
+def transaction_keys(transaction, attributes: Iterable[str] = PARTITIONED_ATTRIBUTES) -> Dict[str, Any]:
+    """Chaves de uma transação nos atributos pedidos (None = não indexar).
+
+    Usada pelas partições e pelas réplicas, para que ambas indexem as
+    mesmas chaves.
+    """
+    keys = {
+        'transaction_id': transaction.transaction_id,
+        'timestamp': transaction.timestamp,
+        'sender': transaction.sender or None,
+        'receiver': transaction.receiver or None
+    }
+    return {attribute: keys[attribute] for attribute in attributes}
+
+
+class IndexPartition:
+    """Índices de timestamp, remetente e destinatário de uma faixa de blocos.
+
+    Enquanto aberta, a partição usa os motores configurados no indexador.
+    Ao ser fechada é congelada em arrays ordenados (imutáveis e compactos)
+    e pode ser descarregada para um segmento em disco, que continua mapeado
+    (mmap) e é consultado no próprio arquivo. Os limites de tempo e os
+    conjuntos de endereços ficam em memória para a poda de consultas.
+    """
+
+    def __init__(self, start_height: int, create_index: Callable[[str], IndexEngine]):
+        self.start_height = start_height
+        self.end_height = start_height  # Exclusivo
+        self.first_block_time: Optional[float] = None
+        self.min_timestamp = float('inf')
+        self.max_timestamp = float('-inf')
+        self.keys: Dict[str, Set[str]] = {'sender': set(), 'receiver': set()}
+        self.key_bounds: Dict[str, Tuple[str, str]] = {}
+        self.indexes: Optional[Dict[str, IndexEngine]] = {
+            attribute: create_index(attribute) for attribute in PARTITIONED_ATTRIBUTES
+        }
+        self.frozen = False
+        self.path: Optional[str] = None  # Segmento em disco, se descarregada
+        self.segment: Optional[Segment] = None
+
+    @property
+    def block_count(self) -> int:
+        return self.end_height - self.start_height
+
+    def add_block(self, block):
+        """Indexa as transações de um bloco na partição."""
+        self.add_blocks([block])
+
+    def add_blocks(self, blocks: List):
+        """Indexa as transações de vários blocos, com uma inserção em lote por índice."""
+        if self.frozen:
+            raise Exception("Partição congelada não aceita novos blocos.")
+        if not blocks:
+            return
+        if self.first_block_time is None:
+            self.first_block_time = blocks[0].timestamp
+
+        items: Dict[str, List[Tuple[Any, Any]]] = {attribute: [] for attribute in PARTITIONED_ATTRIBUTES}
+        for block in blocks:
+            for transaction in block.transactions:
+                entry = (block.index, transaction)
+                for attribute, key in transaction_keys(transaction).items():
+                    if key is None:
+                        continue
+                    items[attribute].append((key, entry))
+                    if attribute in self.keys:
+                        self.keys[attribute].add(key)
+                self.min_timestamp = min(self.min_timestamp, transaction.timestamp)
+                self.max_timestamp = max(self.max_timestamp, transaction.timestamp)
+
+        for attribute, attribute_items in items.items():
+            insert_many(self.indexes[attribute], attribute_items)
+        self.end_height = blocks[-1].index + 1
+
+    def freeze(self):
+        """Fecha a partição, convertendo seus índices em arrays ordenados."""
+        self.indexes = {
+            attribute: SortedArrayIndex.from_index(index) for attribute, index in self.indexes.items()
+        }
+        for attribute, keys in self.keys.items():
+            self.keys[attribute] = frozenset(keys)
+            if keys:
+                self.key_bounds[attribute] = (min(keys), max(keys))
+        self.frozen = True
+
+    def offload(self, directory: str, chain_id: str = ''):
+        """Grava a partição congelada em disco e libera seus índices da memória.
+
+        O nome do arquivo inclui chain_id, para que cadeias diferentes no mesmo
+        diretório não se sobrescrevam; a gravação atômica preserva o arquivo
+        ainda mapeado por outro indexador da mesma cadeia.
+        """
+        if not self.frozen:
+            raise Exception("Apenas partições congeladas podem ser descarregadas.")
+        name = f"partition_{chain_id}_{self.start_height:010d}_{self.end_height:010d}.seg"
+        path = os.path.join(directory, name)
+        tables = {attribute: self.indexes[attribute].get_all_items() for attribute in PARTITIONED_ATTRIBUTES}
+        write_atomic(path, encode_segment(tables, self.start_height, self.end_height))
+        self.path = path
+        self.segment = Segment(path)
+        self.indexes = None
+
+    def get_index(self, attribute: str) -> IndexEngine:
+        """Retorna o índice de um atributo (em memória ou sobre o segmento mapeado)."""
+        if self.indexes is not None:
+            return self.indexes[attribute]
+        # Segmento frio: busca binária no arquivo, decodificando só as entradas encontradas
+        return SegmentIndex(self.segment, attribute)
+
+    def may_contain(self, attribute: str, key: Any) -> bool:
+        """Indica se a chave pode estar na partição (poda de buscas exatas)."""
+        if attribute == 'timestamp':
+            return self.min_timestamp <= key <= self.max_timestamp
+        return key in self.keys[attribute]
+
+    def overlaps(self, attribute: str, min_key: Any, max_key: Any) -> bool:
+        """Indica se o intervalo se sobrepõe às chaves da partição (poda de intervalos)."""
+        if attribute == 'timestamp':
+            return self.min_timestamp <= max_key and min_key <= self.max_timestamp
+        if not self.frozen:
+            return bool(self.keys[attribute])
+        if attribute not in self.key_bounds:
+            return False
+        low, high = self.key_bounds[attribute]
+        return low <= max_key and min_key <= high
+
+
+class PartitionManager:
+    """Divide os índices em partições por faixa de altura ou janela de tempo.
+
+    Uma partição é fechada ao atingir partition_blocks blocos ou
+    partition_seconds segundos. Com cold_storage_dir definido, apenas as
+    hot_partitions partições fechadas mais recentes permanecem em memória.
+    chain_id identifica a cadeia nos nomes dos segmentos em disco.
+    """
+
+    def __init__(self, create_index: Callable[[str], IndexEngine], partition_blocks: int = 1000,
+                 partition_seconds: Optional[float] = None, hot_partitions: int = 4,
+                 cold_storage_dir: Optional[str] = None, chain_id: str = ''):
+        self.create_index = create_index
+        self.chain_id = chain_id
+        self.partition_blocks = partition_blocks
+        self.partition_seconds = partition_seconds
+        self.hot_partitions = hot_partitions
+        self.cold_storage_dir = cold_storage_dir
+        if cold_storage_dir:
+            os.makedirs(cold_storage_dir, exist_ok=True)
+        self.partitions: List[IndexPartition] = []
+
+    def _is_full(self, partition: IndexPartition, block, pending: List = ()) -> bool:
+        """Verifica se o bloco deve abrir uma nova partição.
+
+        pending são os blocos já destinados à partição e ainda não indexados nela.
+        """
+        if partition.block_count + len(pending) >= self.partition_blocks:
+            return True
+        first_block_time = partition.first_block_time
+        if first_block_time is None and pending:
+            first_block_time = pending[0].timestamp
+        return (self.partition_seconds is not None and first_block_time is not None
+                and block.timestamp - first_block_time >= self.partition_seconds)
+
+    def add_block(self, block):
+        """Indexa um bloco na partição aberta, fechando-a se estiver cheia."""
+        self.add_blocks([block])
+
+    def add_blocks(self, blocks: Iterable):
+        """Indexa uma sequência de blocos, um lote por partição.
+
+        Os blocos são agrupados até o limite da partição aberta; cada grupo é
+        indexado com add_blocks da partição antes de ela ser fechada.
+        """
+        pending = []
+        for block in blocks:
+            if not self.partitions or self._is_full(self.partitions[-1], block, pending):
+                if pending:
+                    self.partitions[-1].add_blocks(pending)
+                    pending = []
+                if self.partitions:
+                    self._close(self.partitions[-1])
+                self.partitions.append(IndexPartition(block.index, self.create_index))
+            pending.append(block)
+        if pending:
+            self.partitions[-1].add_blocks(pending)
+
+    def _close(self, partition: IndexPartition):
+        """Congela a partição e descarrega para o disco as que excedem hot_partitions."""
+        partition.freeze()
+        if not self.cold_storage_dir:
+            return
+        in_memory = [p for p in self.partitions if p.frozen and p.indexes is not None]
+        for old in in_memory[:max(len(in_memory) - self.hot_partitions, 0)]:
+            old.offload(self.cold_storage_dir, self.chain_id)
+
+    def view(self, attribute: str) -> 'PartitionedIndex':
+        """Retorna uma visão de índice único sobre um atributo particionado."""
+        return PartitionedIndex(self, attribute)
+
+    def get_partitions_info(self) -> List[Dict[str, Any]]:
+        """Descreve as partições (faixa de blocos, intervalo de tempo e estado)."""
+        return [
+            {
+                'start_height': p.start_height,
+                'end_height': p.end_height,
+                'min_timestamp': p.min_timestamp,
+                'max_timestamp': p.max_timestamp,
+                'state': 'aberta' if not p.frozen else ('em disco' if p.path else 'congelada')
+            }
+            for p in self.partitions
+        ]
+
+
+class PartitionedIndex(IndexEngine):
+    """Visão de um atributo particionado com a interface de IndexEngine.
+
+    Consultas só visitam as partições cujos limites cobrem a chave ou o
+    intervalo; os resultados de várias partições são intercalados em ordem.
+    """
+
+    def __init__(self, manager: PartitionManager, attribute: str):
+        self.manager = manager
+        self.attribute = attribute
+
+    def insert(self, key: Any, value: Any):
+        raise Exception("Inserções em índices particionados passam pelo PartitionManager.")
+
+    def search(self, key: Any) -> Optional[Any]:
+        """Busca uma chave nas partições que podem contê-la."""
+        found = []
+        for partition in self.manager.partitions:
+            if not partition.may_contain(self.attribute, key):
+                continue
+            value = partition.get_index(self.attribute).search(key)
+            if isinstance(value, list):
+                found.extend(value)
+            elif value is not None:
+                found.append(value)
+
+        if not found:
+            return None
+        return found if len(found) > 1 else found[0]
+
+    def iter_search(self, key: Any) -> Iterator[Any]:
+        """Cursor sobre as entradas de uma chave, partição a partição, na ordem da cadeia.
+        
+        Partições seguintes só são consultadas quando o cursor chega a elas,
+        e segmentos em disco decodificam apenas as entradas consumidas.
+        """
+        for partition in self.manager.partitions:
+            if not partition.may_contain(self.attribute, key):
+                continue
+            index = partition.get_index(self.attribute)
+            if isinstance(index, SegmentIndex):
+                yield from index.iter_search(key)
+                continue
+            value = index.search(key)
+            if isinstance(value, list):
+                yield from value
+            elif value is not None:
+                yield value
+    
+    def iter_range(self, min_key: Any, max_key: Any) -> Iterator[Tuple[Any, Any]]:
+        """Intercala, em ordem de chave, os intervalos das partições não podadas.
+        
+        Uma chave presente em várias partições sai uma única vez, com os
+        valores de todas elas, como em um índice não particionado.
+        """
+        cursors = [
+            partition.get_index(self.attribute).iter_range(min_key, max_key)
+            for partition in self.manager.partitions
+            if partition.overlaps(self.attribute, min_key, max_key)
+        ]
+        return _merge_equal_keys(heapq.merge(*cursors, key=itemgetter(0)))
+
+    def get_all_items(self) -> List[Tuple[Any, Any]]:
+        """Retorna todas as chaves-valores em ordem."""
+        cursors = [iter(partition.get_index(self.attribute).get_all_items()) for partition in self.manager.partitions]
+        return list(_merge_equal_keys(heapq.merge(*cursors, key=itemgetter(0))))
+
+    def __len__(self) -> int:
+        """Número de chaves distintas; uma chave presente em várias partições conta uma vez."""
+        indexes = [partition.get_index(self.attribute) for partition in self.manager.partitions]
+        if len(indexes) == 1:
+            return len(indexes[0])
+        # Segmentos em disco fornecem só as chaves, sem decodificar transações
+        cursors = [
+            index.iter_keys() if isinstance(index, SegmentIndex) else (key for key, _ in index.get_all_items())
+            for index in indexes
+        ]
+        return sum(1 for _ in groupby(heapq.merge(*cursors)))
@@ -0,0 +1,337 @@
+"""Réplicas de leitura dos índices compartilhadas entre processos.
+
+Um único processo escritor (ReplicaPublisher) publica os blocos indexados
+como segmentos imutáveis (veja segments.py) em um diretório. Leitores
+(IndexReader) em outros processos mapeiam os segmentos com mmap, somente
+leitura, e fazem as buscas binárias direto sobre os bytes mapeados: nada
+é copiado para o heap além das transações retornadas. Como as páginas
+mapeadas vêm do cache de páginas do sistema operacional, a memória não
+cresce com o número de leitores, e cada leitor consulta em paralelo, sem
+disputar o GIL de outro processo. Em Linux, um diretório em /dev/shm
+mantém os segmentos só em memória.
+
+O manifesto lista os segmentos em ordem de altura e identifica a cadeia
+pelos hashes do bloco gênese e do último bloco publicado.
+"""
+import heapq
+import json
+import os
+from itertools import islice
+from operator import itemgetter
+from typing import List, Dict, Any, Optional, Iterator, Tuple, IO
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from blockchain import Transaction
+from blockchain_indexer import read_page
+from btree import MAX_CHAR
+from partitions import transaction_keys
+from segments import SEGMENT_VERSION, Segment, encode_segment, write_atomic
+
+
+REPLICA_ATTRIBUTES = ('transaction_id', 'timestamp', 'sender', 'receiver')
+MANIFEST_NAME = 'MANIFEST.json'
+LOCK_NAME = 'WRITER.lock'
+
+def encode_blocks(blocks: List) -> bytes:
+    """Codifica os blocos como um segmento de réplica, com uma tabela por atributo."""
+    tables: Dict[str, Dict[Any, List[Tuple[int, Transaction]]]] = {attribute: {} for attribute in REPLICA_ATTRIBUTES}
+    for block in blocks:
+        for transaction in block.transactions:
+            entry = (block.index, transaction)
+            for attribute, key in transaction_keys(transaction, REPLICA_ATTRIBUTES).items():
+                if key is not None:
+                    tables[attribute].setdefault(key, []).append(entry)
+
+    start = blocks[0].index if blocks else 0
+    end = blocks[-1].index + 1 if blocks else 0
+    return encode_segment(
+        {attribute: sorted(keys.items(), key=itemgetter(0)) for attribute, keys in tables.items()},
+        start, end
+    )
+
+
+def _lock_exclusive(path: str) -> IO:
+    """Abre o arquivo de lock e o trava sem esperar; falha se outro processo o detém."""
+    lock_file = open(path, 'a+b')
+    try:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        lock_file.close()
+        raise Exception(f"Outro processo já publica réplicas em {os.path.dirname(path)}.")
+    return lock_file
+
+
+class ReplicaPublisher:
+    """Processo escritor: publica os novos blocos do indexador como segmentos.
+
+    Cada publish grava um segmento com os blocos ainda não publicados e
+    depois troca o manifesto. Segmentos publicados nunca são alterados;
+    para que o número de segmentos não cresça com o de blocos, o segmento
+    novo é mesclado com os anteriores de tamanho menor ou igual (camadas
+    de potências de dois), então a cadeia fica em O(log n) segmentos e
+    cada bloco é regravado O(log n) vezes.
+    Um manifesto de outra cadeia (gênese diferente, ou último bloco
+    publicado ausente da cadeia atual) é substituído por um novo, vazio,
+    e seus segmentos são removidos.
+
+    Só um escritor por diretório: o publicador mantém um lock exclusivo no
+    arquivo WRITER.lock, liberado em close() ou quando o processo termina.
+    Um segundo escritor é recusado em vez de apagar os segmentos do primeiro.
+    """
+
+    def __init__(self, indexer, directory: str):
+        self.indexer = indexer
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock_file = _lock_exclusive(os.path.join(directory, LOCK_NAME))
+        self.segments: List[str] = []
+        self.height = 0
+
+        # Retomar uma publicação anterior no mesmo diretório, se for desta cadeia
+        manifest_path = os.path.join(directory, MANIFEST_NAME)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+            if self._same_chain(manifest):
+                self.segments = manifest['segments']
+                self.height = manifest['height']
+            else:
+                self._write_manifest()
+                self._remove_segments(manifest.get('segments', []))
+
+    def close(self):
+        """Libera o lock de escritor do diretório."""
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    @property
+    def chain(self) -> List:
+        return self.indexer.blockchain.chain
+
+    def _same_chain(self, manifest: Dict[str, Any]) -> bool:
+        """Verifica se o manifesto foi publicado a partir desta cadeia, no formato atual."""
+        height = manifest.get('height', 0)
+        if manifest.get('format') != SEGMENT_VERSION:
+            return False
+        if manifest.get('genesis_hash') != self.chain[0].hash or height > len(self.chain):
+            return False
+        return height == 0 or manifest.get('tip_hash') == self.chain[height - 1].hash
+
+    def _remove_segments(self, names: List[str]):
+        """Remove segmentos que saíram do manifesto (leitores que os mapeiam continuam válidos)."""
+        for name in names:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+    def _write_segment(self, start: int, end: int) -> str:
+        """Grava o segmento dos blocos [start, end) e retorna o nome do arquivo.
+
+        O nome inclui o início do hash gênese, para que segmentos de cadeias
+        diferentes nunca se confundam nos leitores.
+        """
+        name = f"segment_{self.chain[0].hash[:12]}_{start:010d}_{end:010d}.idx"
+        write_atomic(os.path.join(self.directory, name), encode_blocks(self.chain[start:end]))
+        return name
+
+    @staticmethod
+    def _segment_range(name: str) -> Tuple[int, int]:
+        """Faixa de alturas [início, fim) de um segmento, lida do nome do arquivo."""
+        start, end = name[:-len('.idx')].split('_')[-2:]
+        return int(start), int(end)
+
+    def _merge_tail(self) -> List[str]:
+        """Mescla os últimos segmentos enquanto o penúltimo não for maior que o último.
+
+        Retorna os segmentos substituídos, a remover após a troca do manifesto.
+        """
+        replaced = []
+        while len(self.segments) >= 2:
+            previous_start, previous_end = self._segment_range(self.segments[-2])
+            last_start, last_end = self._segment_range(self.segments[-1])
+            if previous_end - previous_start > last_end - last_start:
+                break
+            replaced.extend(self.segments[-2:])
+            self.segments[-2:] = [self._write_segment(previous_start, last_end)]
+        return replaced
+
+    def _write_manifest(self):
+        """Publica a lista de segmentos atual."""
+        manifest = {
+            'format': SEGMENT_VERSION,
+            'height': self.height,
+            'genesis_hash': self.chain[0].hash,
+            'tip_hash': self.chain[self.height - 1].hash if self.height else None,
+            'segments': self.segments
+        }
+        write_atomic(os.path.join(self.directory, MANIFEST_NAME), json.dumps(manifest).encode())
+
+    def publish(self) -> int:
+        """Publica os blocos minerados desde a última chamada. Retorna quantos foram publicados."""
+        height = len(self.indexer.blockchain.chain)
+        if height <= self.height:
+            return 0
+        self.segments.append(self._write_segment(self.height, height))
+        replaced = self._merge_tail()
+        published = height - self.height
+        self.height = height
+        self._write_manifest()
+        self._remove_segments([name for name in replaced if name not in self.segments])
+        return published
+
+    def compact(self):
+        """Reescreve todos os segmentos em um só, reduzindo o número de buscas por consulta.
+
+        Os arquivos antigos são removidos depois da troca do manifesto;
+        leitores que ainda os mapeiam continuam válidos até o próximo refresh.
+        """
+        self.publish()
+        if len(self.segments) <= 1:
+            return
+        old_segments = self.segments
+        self.segments = [self._write_segment(0, self.height)]
+        self._write_manifest()
+        self._remove_segments([name for name in old_segments if name not in self.segments])
+
+
+class IndexReader:
+    """Cliente somente leitura dos segmentos publicados por um ReplicaPublisher.
+
+    Oferece as consultas de transações do BlockchainIndexer, com os mesmos
+    formatos de resultado. Antes de cada consulta o manifesto é verificado
+    e os segmentos novos são mapeados; os já mapeados são reaproveitados.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.segments: Dict[str, Segment] = {}
+        self.order: List[str] = []
+        self.ordered_segments: List[Segment] = []  # Segmentos do manifesto atual, em ordem
+        self.height = 0
+        self._manifest_version = None
+        self.refresh()
+
+    def refresh(self) -> bool:
+        """Recarrega o manifesto se ele mudou. Retorna True se houve mudança.
+
+        Se um segmento listado já foi removido (o escritor mesclou segmentos
+        depois da leitura do manifesto), o manifesto novo é lido outra vez.
+        """
+        path = os.path.join(self.directory, MANIFEST_NAME)
+        while True:
+            try:
+                status = os.stat(path)
+            except FileNotFoundError:
+                return False
+            version = (status.st_mtime_ns, status.st_size, status.st_ino)
+            if version == self._manifest_version:
+                return False
+
+            with open(path, encoding='utf-8') as f:
+                manifest = json.load(f)
+            mapped: Dict[str, Segment] = {}
+            try:
+                for name in manifest['segments']:
+                    mapped[name] = self.segments.get(name) or Segment(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                for name, segment in mapped.items():
+                    if name not in self.segments:
+                        segment.close()
+                continue
+
+            # Segmentos que saíram do manifesto não são fechados aqui: outra
+            # thread pode estar percorrendo-os; o mapeamento é desfeito quando
+            # a última referência desaparece
+            self.segments = mapped
+            self.ordered_segments = [mapped[name] for name in manifest['segments']]
+            self.order = manifest['segments']
+            self.height = manifest['height']
+            self._manifest_version = version
+            return True
+
+    def close(self):
+        """Desfaz o mapeamento de todos os segmentos."""
+        for segment in self.segments.values():
+            segment.close()
+        self.segments = {}
+        self.ordered_segments = []
+        self.order = []
+
+    @staticmethod
+    def _to_result(entry: Tuple[int, Transaction]) -> Dict[str, Any]:
+        block_index, transaction = entry
+        return {'block_index': block_index, 'transaction': transaction.to_dict()}
+
+    def _iter_search(self, attribute: str, key: Any) -> Iterator[Dict[str, Any]]:
+        """Cursor da busca exata em todos os segmentos, na ordem da cadeia."""
+        self.refresh()
+        for segment in self.ordered_segments:
+            for entry in segment.iter_search(attribute, key):
+                yield self._to_result(entry)
+
+    def _search(self, attribute: str, key: Any) -> List[Dict[str, Any]]:
+        """Busca exata em todos os segmentos, na ordem da cadeia."""
+        return list(self._iter_search(attribute, key))
+
+    def get_chain_height(self) -> int:
+        """Altura publicada (número de blocos visíveis para o leitor)."""
+        self.refresh()
+        return self.height
+
+    def get_transaction_by_id(self, transaction_id: str) -> Optional[Dict[str, Any]]:
+        """Busca uma transação por ID."""
+        results = self._search('transaction_id', transaction_id)
+        return results[0] if results else None
+
+    def get_transactions_by_sender(self, sender: str) -> List[Dict[str, Any]]:
+        """Busca transações por remetente."""
+        return self._search('sender', sender)
+
+    def get_transactions_by_receiver(self, receiver: str) -> List[Dict[str, Any]]:
+        """Busca transações por destinatário."""
+        return self._search('receiver', receiver)
+
+    def get_transactions_by_sender_page(self, sender: str, offset: int = 0, limit: int = 20) -> Dict[str, Any]:
+        """Retorna uma página das transações de um remetente (mesmo formato do indexador)."""
+        return read_page(self._iter_search('sender', sender), offset, limit)
+
+    def get_transactions_by_receiver_page(self, receiver: str, offset: int = 0, limit: int = 20) -> Dict[str, Any]:
+        """Retorna uma página das transações para um destinatário (mesmo formato do indexador)."""
+        return read_page(self._iter_search('receiver', receiver), offset, limit)
+
+    def search_transactions_by_id_prefix(self, prefix: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Busca transações cujo ID começa com prefix (busca binária em cada segmento)."""
+        self.refresh()
+        cursors = [
+            segment.iter_range('transaction_id', prefix, prefix + MAX_CHAR)
+            for segment in self.ordered_segments
+        ]
+        matches = heapq.merge(*cursors, key=itemgetter(0))
+        return [self._to_result(entry) for _, entries in islice(matches, limit) for entry in entries][:limit]
+
+    def iter_transactions_by_time_range(self, start_time: float, end_time: float) -> Iterator[Dict[str, Any]]:
+        """Cursor sobre as transações de um intervalo, intercalando os segmentos em ordem de tempo."""
+        self.refresh()
+        cursors = [segment.iter_range('timestamp', start_time, end_time) for segment in self.ordered_segments]
+        for _, entries in heapq.merge(*cursors, key=itemgetter(0)):
+            for entry in entries:
+                yield self._to_result(entry)
+
+    def get_transactions_by_time_range(self, start_time: float, end_time: float) -> List[Dict[str, Any]]:
+        """Busca transações em um intervalo de tempo."""
+        return list(self.iter_transactions_by_time_range(start_time, end_time))
+
+    def get_transactions_by_time_range_page(self, start_time: float, end_time: float,
+                                            offset: int = 0, limit: int = 20) -> Dict[str, Any]:
+        """Retorna uma página de transações de um intervalo de tempo (mesmo formato do indexador)."""
+        return read_page(self.iter_transactions_by_time_range(start_time, end_time), offset, limit)
@@ -0,0 +1,84 @@
+"""Lock de leitura e escrita para objetos compartilhados entre sessões."""
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+
+class ReadWriteLock:
+    """Várias leituras simultâneas ou uma escrita exclusiva.
+
+    Escritores têm prioridade: com uma escrita aguardando, novas leituras
+    esperam, para que a mineração não fique bloqueada por consultas
+    contínuas. A thread que detém a escrita pode ler sem novo bloqueio, e
+    leituras aninhadas na mesma thread não esperam por escritores.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writer = None          # Identificador da thread que detém a escrita
+        self._waiting_writers = 0
+        self._local = threading.local()  # Profundidade de leitura por thread
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        depth = getattr(self._local, 'depth', 0)
+        if self._writer == threading.get_ident() or depth:
+            self._local.depth = depth + 1
+            try:
+                yield
+            finally:
+                self._local.depth = depth
+            return
+
+        with self._condition:
+            while self._writer is not None or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        self._local.depth = 1
+        try:
+            yield
+        finally:
+            self._local.depth = 0
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writer is not None or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = threading.get_ident()
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer = None
+                self._condition.notify_all()
+
+
+class ReadLocked:
+    """Visão de um objeto cujos métodos executam sob a leitura de um ReadWriteLock.
+
+    As escritas usam o objeto original dentro de lock.write(). Métodos que
+    retornam cursores (iter_*) não são protegidos além da chamada; use as
+    versões paginadas ou em lista.
+    """
+
+    def __init__(self, target: Any, lock: ReadWriteLock):
+        self._target = target
+        self._lock = lock
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._target, name)
+        if not callable(attribute):
+            return attribute
+
+        def locked(*args, **kwargs):
+            with self._lock.read():
+                return attribute(*args, **kwargs)
+        return locked
@@ -0,0 +1,343 @@
+"""Segmentos imutáveis de índices, consultados no próprio arquivo via mmap.
+
+Um segmento guarda cada transação uma única vez (altura + Transaction.to_bytes)
+e, para cada atributo, uma tabela ordenada de chaves. A busca lê só as
+chaves visitadas direto dos bytes mapeados; apenas as transações das
+chaves encontradas são decodificadas. As páginas mapeadas ficam no cache
+do sistema operacional e são compartilhadas entre processos.
+
+Formato: cabeçalho, diretório (nome, offset e tamanho de cada tabela),
+região de transações e tabelas. Tabela: número de chaves e tipo
+(s = string, d = float), offsets dos pontos de reinício e registros; um
+registro é a chave seguida dos offsets das transações com aquela chave.
+Chaves string são codificadas por prefixo (front coding): cada registro
+guarda só o tamanho do prefixo comum com a chave anterior e o sufixo. A
+cada RESTART_INTERVAL registros a chave é gravada inteira (ponto de
+reinício); a busca binária percorre os pontos de reinício e decodifica
+em sequência no máximo RESTART_INTERVAL registros.
+"""
+import mmap
+import os
+import struct
+from typing import List, Dict, Any, Optional, Iterator, Iterable, Tuple
+
+from blockchain import Transaction, _pack_str, _unpack_str
+from index_engines import IndexEngine
+
+
+_MAGIC = b'BIXS'
+SEGMENT_VERSION = 2
+RESTART_INTERVAL = 16  # Registros por bloco de chaves codificadas por prefixo
+_SEGMENT_HEADER = struct.Struct('<4sBQQI')  # magic, versão, altura inicial, altura final (exclusiva), tabelas
+_SECTION = struct.Struct('<QQ')             # Offset e tamanho de uma seção
+_TABLE_HEADER = struct.Struct('<Ic')        # Número de chaves e tipo da chave
+_OFFSET = struct.Struct('<Q')
+_COUNT = struct.Struct('<I')
+_HEIGHT = struct.Struct('<Q')
+_FLOAT = struct.Struct('<d')
+
+Entry = Tuple[int, Transaction]  # (altura do bloco, transação)
+
+
+def _entries_of(value) -> List[Entry]:
+    """Lista de entradas de um valor de índice (entrada única ou lista)."""
+    return value if isinstance(value, list) else [value]
+
+
+def _shared_prefix_length(a: bytes, b: bytes) -> int:
+    """Retorna o tamanho do prefixo comum entre duas chaves codificadas."""
+    limit = min(len(a), len(b))
+    i = 0
+    while i < limit and a[i] == b[i]:
+        i += 1
+    return i
+
+
+def _pack_varint(value: int) -> bytes:
+    """Codifica um inteiro não negativo em 7 bits por byte (LEB128)."""
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _unpack_varint(data, offset: int) -> Tuple[int, int]:
+    """Decodifica um varint, retornando o valor e o próximo offset."""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def _encode_table(items: List[Tuple[Any, List[int]]]) -> bytes:
+    """Codifica a tabela ordenada de um atributo (chave -> offsets de transações)."""
+    kind = b'd' if items and not isinstance(items[0][0], str) else b's'
+    records = []
+    previous = b''
+    for position, (key, offsets) in enumerate(items):
+        if kind == b's':
+            encoded = key.encode()
+            # Pontos de reinício guardam a chave inteira
+            shared = 0 if position % RESTART_INTERVAL == 0 else _shared_prefix_length(previous, encoded)
+            suffix = encoded[shared:]
+            encoded_key = _pack_varint(shared) + _pack_varint(len(suffix)) + suffix
+            previous = encoded
+        else:
+            encoded_key = _FLOAT.pack(key)
+        records.append(encoded_key + _COUNT.pack(len(offsets)) + b''.join(_OFFSET.pack(o) for o in offsets))
+
+    # Offsets dos pontos de reinício, relativos ao início da tabela
+    restarts = range(0, len(records), RESTART_INTERVAL)
+    position = _TABLE_HEADER.size + _OFFSET.size * len(restarts)
+    restart_offsets = []
+    for index, record in enumerate(records):
+        if index % RESTART_INTERVAL == 0:
+            restart_offsets.append(_OFFSET.pack(position))
+        position += len(record)
+    return _TABLE_HEADER.pack(len(records), kind) + b''.join(restart_offsets) + b''.join(records)
+
+
+def encode_segment(tables: Dict[str, Iterable[Tuple[Any, Any]]], start_height: int, end_height: int) -> bytes:
+    """Codifica índices como um segmento imutável.
+
+    tables mapeia o nome do atributo para seus itens (chave, valor) em ordem
+    de chave, com chaves únicas; os valores são entradas (altura, transação)
+    ou listas delas. Transações presentes em várias tabelas são gravadas uma vez.
+    """
+    directory = b''.join(_pack_str(name) + _SECTION.pack(0, 0) for name in tables)
+    base = _SEGMENT_HEADER.size + len(directory)
+
+    transactions = []
+    transaction_offsets: Dict[int, int] = {}  # id(transação) -> offset no segmento
+    position = base
+    encoded_tables = []
+    for items in tables.values():
+        table_items = []
+        for key, value in items:
+            offsets = []
+            for block_index, transaction in _entries_of(value):
+                offset = transaction_offsets.get(id(transaction))
+                if offset is None:
+                    data = _HEIGHT.pack(block_index) + transaction.to_bytes()
+                    offset = transaction_offsets[id(transaction)] = position
+                    transactions.append(data)
+                    position += len(data)
+                offsets.append(offset)
+            table_items.append((key, offsets))
+        encoded_tables.append(_encode_table(table_items))
+
+    # Diretório com os offsets finais das tabelas
+    directory = []
+    for name, table in zip(tables, encoded_tables):
+        directory.append(_pack_str(name) + _SECTION.pack(position, len(table)))
+        position += len(table)
+
+    header = _SEGMENT_HEADER.pack(_MAGIC, SEGMENT_VERSION, start_height, end_height, len(encoded_tables))
+    return b''.join([header] + directory + transactions + encoded_tables)
+
+
+def write_atomic(path: str, data: bytes):
+    """Grava o arquivo por inteiro antes de torná-lo visível.
+
+    Quem ainda mapeia uma versão anterior do mesmo caminho continua lendo o
+    arquivo antigo (os.replace troca a entrada do diretório, não o conteúdo),
+    e leitores nunca veem meio arquivo.
+    """
+    temporary = path + '.tmp'
+    with open(temporary, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+
+class Segment:
+    """Segmento mapeado em memória, consultado sem decodificar as tabelas."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.data = memoryview(self.mmap)
+        magic, version, self.start_height, self.end_height, count = _SEGMENT_HEADER.unpack_from(self.data, 0)
+        if magic != _MAGIC or version != SEGMENT_VERSION:
+            raise ValueError(f"Segmento inválido: {path}")
+
+        offset = _SEGMENT_HEADER.size
+        self.tables: Dict[str, Tuple[int, int, bytes]] = {}  # atributo -> (offset, chaves, tipo)
+        for _ in range(count):
+            name, offset = _unpack_str(self.data, offset)
+            table_offset, _ = _SECTION.unpack_from(self.data, offset)
+            offset += _SECTION.size
+            keys, kind = _TABLE_HEADER.unpack_from(self.data, table_offset)
+            self.tables[name] = (table_offset, keys, kind)
+        self._bounds: Dict[str, Optional[Tuple[Any, Any]]] = {}
+
+    def close(self):
+        self.data.release()
+        self.mmap.close()
+
+    def __len__(self) -> int:
+        return sum(keys for _, keys, _ in self.tables.values())
+
+    def key_count(self, attribute: str) -> int:
+        return self.tables[attribute][1]
+
+    def _encode_key(self, attribute: str, key: Any) -> Any:
+        """Chave no formato comparável da tabela (strings viram bytes UTF-8, de mesma ordem)."""
+        return key.encode() if self.tables[attribute][2] == b's' else key
+
+    def _restart_offset(self, attribute: str, block: int) -> int:
+        """Offset absoluto do primeiro registro de um bloco de chaves."""
+        table_offset = self.tables[attribute][0]
+        (record_offset,) = _OFFSET.unpack_from(self.data, table_offset + _TABLE_HEADER.size + _OFFSET.size * block)
+        return table_offset + record_offset
+
+    def _decode_key(self, kind: bytes, offset: int, previous: Any) -> Tuple[Any, int]:
+        """Decodifica a chave de um registro (dada a anterior) e retorna o offset das entradas."""
+        if kind == b'd':
+            return _FLOAT.unpack_from(self.data, offset)[0], offset + _FLOAT.size
+        shared, offset = _unpack_varint(self.data, offset)
+        length, offset = _unpack_varint(self.data, offset)
+        return previous[:shared] + bytes(self.data[offset:offset + length]), offset + length
+
+    def _scan(self, attribute: str, block: int) -> Iterator[Tuple[Any, int]]:
+        """Percorre (chave codificada, offset das entradas) a partir do início de um bloco."""
+        _, count, kind = self.tables[attribute]
+        if block * RESTART_INTERVAL >= count:
+            return
+        offset = self._restart_offset(attribute, block)
+        key = b''
+        for _ in range(block * RESTART_INTERVAL, count):
+            key, entries_offset = self._decode_key(kind, offset, key)
+            yield key, entries_offset
+            (entry_count,) = _COUNT.unpack_from(self.data, entries_offset)
+            offset = entries_offset + _COUNT.size + _OFFSET.size * entry_count
+
+    def _seek(self, attribute: str, key: Any) -> Iterator[Tuple[Any, int]]:
+        """Registros com chave >= key (já codificada), em ordem.
+
+        A busca binária lê só as chaves dos pontos de reinício; dentro do
+        bloco encontrado, no máximo RESTART_INTERVAL registros são decodificados.
+        """
+        _, count, kind = self.tables[attribute]
+        low, high = 0, -(-count // RESTART_INTERVAL)
+        # Último bloco cuja primeira chave é <= key
+        while high - low > 1:
+            middle = (low + high) // 2
+            if self._decode_key(kind, self._restart_offset(attribute, middle), b'')[0] <= key:
+                low = middle
+            else:
+                high = middle
+        for found, entries_offset in self._scan(attribute, low):
+            if found >= key:
+                yield found, entries_offset
+
+    def _last_key(self, attribute: str) -> Any:
+        """Maior chave da tabela (decodifica apenas o último bloco)."""
+        count = self.tables[attribute][1]
+        key = None
+        for key, _ in self._scan(attribute, (count - 1) // RESTART_INTERVAL):
+            pass
+        return key
+
+    def iter_keys(self, attribute: str) -> Iterator[Any]:
+        """Cursor sobre as chaves da tabela, em ordem, sem decodificar transações."""
+        decode = self.tables[attribute][2] == b's'
+        for key, _ in self._scan(attribute, 0):
+            yield key.decode() if decode else key
+
+    def _iter_entries(self, offset: int) -> Iterator[Entry]:
+        """Decodifica, uma a uma, as transações referenciadas por um registro."""
+        (count,) = _COUNT.unpack_from(self.data, offset)
+        offset += _COUNT.size
+        for _ in range(count):
+            (transaction_offset,) = _OFFSET.unpack_from(self.data, offset)
+            offset += _OFFSET.size
+            (height,) = _HEIGHT.unpack_from(self.data, transaction_offset)
+            transaction, _ = Transaction.from_bytes(self.data, transaction_offset + _HEIGHT.size)
+            yield height, transaction
+
+    def _entries(self, offset: int) -> List[Entry]:
+        """Decodifica as transações referenciadas por um registro."""
+        return list(self._iter_entries(offset))
+
+    def bounds(self, attribute: str) -> Optional[Tuple[Any, Any]]:
+        """Menor e maior chave (codificadas) da tabela, para poda."""
+        if attribute not in self._bounds:
+            count, kind = self.tables[attribute][1], self.tables[attribute][2]
+            self._bounds[attribute] = None if not count else (
+                self._decode_key(kind, self._restart_offset(attribute, 0), b'')[0],
+                self._last_key(attribute)
+            )
+        return self._bounds[attribute]
+
+    def iter_search(self, attribute: str, key: Any) -> Iterator[Entry]:
+        """Cursor sobre as entradas com a chave exata (decodificadas sob demanda)."""
+        encoded = self._encode_key(attribute, key)
+        for found, entries_offset in self._seek(attribute, encoded):
+            if found == encoded:
+                yield from self._iter_entries(entries_offset)
+            return
+
+    def search(self, attribute: str, key: Any) -> List[Entry]:
+        """Entradas com a chave exata."""
+        return list(self.iter_search(attribute, key))
+
+    def iter_range(self, attribute: str, min_key: Any, max_key: Any) -> Iterator[Tuple[Any, List[Entry]]]:
+        """Cursor sobre (chave, entradas) com chave em [min_key, max_key], em ordem."""
+        low, high = self._encode_key(attribute, min_key), self._encode_key(attribute, max_key)
+        bounds = self.bounds(attribute)
+        if bounds is None or bounds[0] > high or bounds[1] < low:
+            return
+        decode = self.tables[attribute][2] == b's'
+        for key, entries_offset in self._seek(attribute, low):
+            if key > high:
+                break
+            yield (key.decode() if decode else key), self._entries(entries_offset)
+
+
+class SegmentIndex(IndexEngine):
+    """Visão somente leitura de um atributo de um Segment, com a interface de IndexEngine."""
+
+    def __init__(self, segment: Segment, attribute: str):
+        self.segment = segment
+        self.attribute = attribute
+
+    def insert(self, key: Any, value: Any):
+        raise Exception("Segmentos são imutáveis.")
+
+    def search(self, key: Any) -> Optional[Any]:
+        entries = self.segment.search(self.attribute, key)
+        if not entries:
+            return None
+        return entries if len(entries) > 1 else entries[0]
+
+    def iter_search(self, key: Any) -> Iterator[Entry]:
+        return self.segment.iter_search(self.attribute, key)
+
+    def iter_keys(self) -> Iterator[Any]:
+        return self.segment.iter_keys(self.attribute)
+
+    def iter_range(self, min_key: Any, max_key: Any) -> Iterator[Tuple[Any, Any]]:
+        for key, entries in self.segment.iter_range(self.attribute, min_key, max_key):
+            yield key, (entries if len(entries) > 1 else entries[0])
+
+    def get_all_items(self) -> List[Tuple[Any, Any]]:
+        bounds = self.segment.bounds(self.attribute)
+        if bounds is None:
+            return []
+        low, high = bounds
+        if isinstance(low, bytes):
+            low, high = low.decode(), high.decode()
+        return list(self.iter_range(low, high))
+
+    def __len__(self) -> int:
+        return self.segment.key_count(self.attribute)